@@ -1,7 +1,15 @@
+import os
 import sys
 from pathlib import Path
 
 # Add backend directory to Python path so app package is importable
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
 
+# Serverless instances are frozen between invocations; let the platform's
+# transaction pooler hold connections instead of a per-instance QueuePool.
+os.environ.setdefault("DATABASE_POOL_MODE", "serverless")
+# Frozen instances would stall any job they claimed until its lease ran out;
+# run generation jobs elsewhere with `python -m app.manage run-jobs`.
+os.environ.setdefault("GENERATION_WORKERS", "0")
+
 from app.main import app  # noqa: E402, F401
@@ -1,25 +1,29 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth.jwt_handler import decode_purpose_token, decode_token
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid or expired token",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+unavailable_exception = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Service temporarily unavailable, please retry",
+)
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid or expired token",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+
+def user_id_from_token(token: str) -> int:
     payload = decode_token(token)
     if payload is None:
         raise credentials_exception
@@ -32,32 +36,62 @@ def get_current_user(
     if sub is None:
         raise credentials_exception
     try:
-        user_id = int(sub)
+        return int(sub)
     except (ValueError, TypeError):
         raise credentials_exception
 
+
+def _require_onboarded(user: User) -> User:
+    if user.onboarding_step < 5:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account onboarding not complete",
+        )
+    return user
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> User:
+    user_id = user_id_from_token(token)
     try:
         user = db.query(User).filter(User.id == user_id).first()
     except OperationalError:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Service temporarily unavailable, please retry",
-        )
+        raise unavailable_exception
     if user is None:
         raise credentials_exception
 
+    db.info["user_id"] = user.id
     return user
 
 
 def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
-    if current_user.onboarding_step < 5:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Account onboarding not complete",
-        )
-    return current_user
+    return _require_onboarded(current_user)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    user_id = user_id_from_token(token)
+    try:
+        user = await db.scalar(select(User).where(User.id == user_id))
+    except OperationalError:
+        raise unavailable_exception
+    if user is None:
+        raise credentials_exception
+
+    db.info["user_id"] = user.id
+    return user
+
+
+async def get_current_active_user_async(
+    current_user: User = Depends(get_current_user_async),
+) -> User:
+    return _require_onboarded(current_user)
 
 
 def require_admin(
@@ -106,10 +140,7 @@ def get_onboarding_user(
     try:
         user = db.query(User).filter(User.id == user_id).first()
     except OperationalError:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Service temporarily unavailable, please retry",
-        )
+        raise unavailable_exception
     if user is None:
         raise credentials_exception
 
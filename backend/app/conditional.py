@@ -0,0 +1,30 @@
+"""ETag helpers for conditional GETs on per-user resources."""
+
+from fastapi import Request, Response
+
+# Responses depend on the bearer token, so shared caches must not store them
+# and browsers must revalidate before reuse.
+CACHE_HEADERS = {"Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+
+def _opaque(tag: str) -> str:
+    return tag.removeprefix("W/")
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    # If-None-Match uses the weak comparison: W/"x" matches "x"
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag.strip()) for tag in header.split(",")}
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers.update(CACHE_HEADERS)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, **CACHE_HEADERS})
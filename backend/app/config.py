@@ -4,6 +4,21 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     SECRET_KEY: str
     DATABASE_URL: str = "sqlite:///./qwiz_me.db"
+    DATABASE_POOL_MODE: str = "queue"  # "queue" for long-lived workers, "serverless" behind a transaction pooler
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: int = 30
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_REPLICA_URL: str = ""  # comma-separated read replicas
+    REPLICA_STICKY_SECONDS: int = 5  # read from primary this long after a user's write
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # 256MB
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024  # 64MB page cache per connection
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    ANSWER_KEY_CACHE_SIZE: int = 4096  # quizzes whose answer keys stay in memory per worker
+    QUIZ_DETAIL_CACHE_SIZE: int = 512  # encoded GET /quizzes/{id} bodies kept per worker; 0 disables
+    QUIZ_DETAIL_CACHE_TTL: int = 300  # seconds; bounds staleness after a delete on another worker
+    QUIZ_ANALYTICS_CACHE_SIZE: int = 256  # encoded GET /quizzes/{id}/analytics bodies kept per worker; 0 disables
+    QUIZ_ANALYTICS_CACHE_TTL: int = 60  # seconds; bounds staleness after an attempt on another worker
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
     ALGORITHM: str = "HS256"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
@@ -17,6 +32,18 @@ class Settings(BaseSettings):
     SUPABASE_URL: str = ""
     SUPABASE_SERVICE_KEY: str = ""
     FOUNDER_EMAIL: str = ""
+    AI_CLIENT_POOL_SIZE: int = 64  # provider clients (one per user API key) kept alive per worker
+    AI_TIMEOUT_SECONDS: float = 120
+    ANTHROPIC_BASE_URL: str = ""  # override for a proxy or local test server; empty uses the SDK default
+    OPENAI_BASE_URL: str = ""  # as above; include the /v1 suffix
+    IMAGE_PREP_WORKERS: int = 2  # threads per worker that shrink uploads before they go to the AI provider
+    GENERATION_WORKERS: int = 2  # background generation jobs run concurrently per web worker; 0 disables
+    GENERATION_JOB_POLL_SECONDS: float = 2.0  # idle workers check for jobs queued by other processes this often
+    GENERATION_JOB_LEASE_SECONDS: int = 300  # renewed while a job runs; a job whose worker died is retried after this
+    GENERATION_JOB_MAX_ATTEMPTS: int = 3
+    GENERATED_QUIZ_CACHE_SIZE: int = 50_000  # quizzes reused for identical uploads, shared by all workers; 0 disables
+    GENERATED_QUIZ_CACHE_TTL: int = 30 * 24 * 3600  # seconds since an entry was last used
+    NEAR_DUPLICATE_DISTANCE: int = 5  # of 64 perceptual-hash bits; closer cached images are offered; 0 disables
 
     model_config = {"env_file": ".env"}
 
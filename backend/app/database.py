@@ -1,32 +1,307 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
-from sqlalchemy.pool import NullPool
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 
 from app.config import settings
 
-connect_args = {}
-db_url = settings.DATABASE_URL
+POOL_MODES = ("queue", "serverless")
+
+
+class PoolStats:
+    """Process-wide connection pool counters, exposed via /admin/metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.timeouts = 0
+            self.waits = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds_total / self.waits * 1000, 3) if self.waits else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+pool_stats = PoolStats()
+_in_wait: ContextVar[bool] = ContextVar("_in_wait", default=False)
 
-if db_url.startswith("sqlite"):
-    connect_args["check_same_thread"] = False
-elif db_url.startswith("postgresql://"):
-    db_url = db_url.replace("postgresql://", "postgresql+psycopg://", 1)
-    connect_args["connect_timeout"] = 10
 
-pool_kwargs = {}
-if db_url.startswith("sqlite"):
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def _do_get(self):
+        # QueuePool._do_get retries itself on overflow races; only time the outer call
+        if _in_wait.get():
+            return super()._do_get()
+        token = _in_wait.set(True)
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            _in_wait.reset(token)
+            pool_stats.record_wait(time.perf_counter() - start, timed_out)
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
     pass
-else:
-    pool_kwargs["poolclass"] = NullPool
-
-engine = create_engine(
-    db_url,
-    connect_args=connect_args,
-    pool_pre_ping=True,
-    **pool_kwargs,
-)
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and url.split("://", 1)[1] in ("", "/:memory:")
+
+
+def _pool_kwargs(url: str, mode: str, is_async: bool = False) -> dict:
+    if mode not in POOL_MODES:
+        raise ValueError(f"Unknown DATABASE_POOL_MODE: {mode}")
+    if _is_memory_sqlite(url):
+        return {}
+    if mode == "serverless":
+        # Each invocation may be frozen or killed, so never hold connections
+        # between requests; the platform's pooler (PgBouncer/Supavisor) pools.
+        return {"poolclass": NullPool}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+    }
+
+
+def _connect_args(url: str, mode: str) -> dict:
+    connect_args = {}
+    if url.startswith("sqlite"):
+        connect_args["check_same_thread"] = False
+    elif url.startswith("postgresql+psycopg://"):
+        connect_args["connect_timeout"] = 10
+        if mode == "serverless":
+            # Transaction poolers hand each transaction a different backend,
+            # so server-side prepared statements cannot be reused.
+            connect_args["prepare_threshold"] = None
+    return connect_args
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    # Let the "begin" hook below emit BEGIN instead of the driver, so write
+    # sessions can take the write lock up front
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    for pragma in (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA foreign_keys=ON",
+    ):
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _begin_sqlite_transaction(conn) -> None:
+    # A DEFERRED transaction that reads and then writes fails immediately
+    # with "database is locked" if another writer committed in between;
+    # write sessions start IMMEDIATE and queue on busy_timeout instead.
+    mode = conn.get_execution_options().get("sqlite_begin", "DEFERRED")
+    conn.exec_driver_sql(f"BEGIN {mode}")
+
+
+def _apply_sqlite_profile(engine) -> None:
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(engine, "begin", _begin_sqlite_transaction)
+
+
+def _attach_pool_stats(engine) -> None:
+    event.listen(engine, "connect", lambda *args: pool_stats.record_connect())
+    event.listen(engine, "checkout", lambda *args: pool_stats.record_checkout())
+    event.listen(engine, "checkin", lambda *args: pool_stats.record_checkin())
+
+
+def normalize_url(url: str) -> str:
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+psycopg://", 1)
+    return url
+
+
+def async_url(url: str) -> str:
+    # psycopg 3 serves both sync and async; SQLite needs the aiosqlite driver
+    url = normalize_url(url)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+def build_engine(url: str, mode: str | None = None):
+    url = normalize_url(url)
+    mode = mode or settings.DATABASE_POOL_MODE
+    engine = create_engine(
+        url,
+        connect_args=_connect_args(url, mode),
+        pool_pre_ping=True,
+        **_pool_kwargs(url, mode),
+    )
+    if url.startswith("sqlite"):
+        _apply_sqlite_profile(engine)
+    _attach_pool_stats(engine)
+    return engine
+
+
+def build_async_engine(url: str, mode: str | None = None):
+    url = async_url(url)
+    mode = mode or settings.DATABASE_POOL_MODE
+    engine = create_async_engine(
+        url,
+        connect_args=_connect_args(url, mode),
+        pool_pre_ping=True,
+        **_pool_kwargs(url, mode, is_async=True),
+    )
+    if url.startswith("sqlite"):
+        _apply_sqlite_profile(engine.sync_engine)
+    _attach_pool_stats(engine.sync_engine)
+    return engine
+
+
+engine = build_engine(settings.DATABASE_URL)
+async_engine = build_async_engine(settings.DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Sessions for request handlers that write; on SQLite they take the write lock
+# at BEGIN so concurrent writers queue instead of failing.
+WriteSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine.execution_options(sqlite_begin="IMMEDIATE")
+)
+AsyncWriteSessionLocal = async_sessionmaker(
+    async_engine.execution_options(sqlite_begin="IMMEDIATE"), autoflush=False, expire_on_commit=False
+)
+
+_replica_urls = [u.strip() for u in settings.DATABASE_REPLICA_URL.split(",") if u.strip()]
+ReplicaSessions = [
+    sessionmaker(autocommit=False, autoflush=False, bind=build_engine(u)) for u in _replica_urls
+]
+AsyncReplicaSessions = [
+    async_sessionmaker(build_async_engine(u), autoflush=False, expire_on_commit=False) for u in _replica_urls
+]
+
+
+class RecentWrites:
+    """Users who committed a write within the last `window` seconds.
+
+    Tracked per process: with several workers a user may still land on a
+    replica from a worker that did not see the write, so keep the window
+    above typical replication lag.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._lock = threading.Lock()
+        self._last_write: dict[int, float] = {}
+
+    def mark(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[user_id] = now
+            if len(self._last_write) > 10_000:
+                self._last_write = {
+                    uid: ts for uid, ts in self._last_write.items() if now - ts < self.window
+                }
+
+    def __contains__(self, user_id: int) -> bool:
+        ts = self._last_write.get(user_id)
+        return ts is not None and time.monotonic() - ts < self.window
+
+
+recent_writes = RecentWrites(settings.REPLICA_STICKY_SECONDS)
+
+
+# Sessions learn their user from the auth dependencies (session.info["user_id"]);
+# any committed write then pins that user's reads to the primary for a while.
+@event.listens_for(Session, "after_flush")
+def _flag_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _track_write(session):
+    user_id = session.info.get("user_id")
+    if session.info.pop("wrote", False) and user_id is not None:
+        recent_writes.mark(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_write(session):
+    session.info.pop("wrote", None)
+
+
+def choose_sessionmaker(primary, replicas: list, user_id: int | None):
+    if not replicas or (user_id is not None and user_id in recent_writes):
+        return primary
+    return random.choice(replicas)
+
+
+def _request_user_id(request: Request) -> int | None:
+    from app.auth.jwt_handler import decode_token
+
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = decode_token(token) or {}
+    try:
+        return int(payload.get("sub"))
+    except (TypeError, ValueError):
+        return None
 
 
 class Base(DeclarativeBase):
@@ -41,7 +316,68 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_write_db(request: Request):
+    db = WriteSessionLocal()
+    db.info["user_id"] = _request_user_id(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_write_db(request: Request):
+    async with AsyncWriteSessionLocal() as db:
+        db.info["user_id"] = _request_user_id(request)
+        yield db
+
+
+def get_read_db(request: Request):
+    db = choose_sessionmaker(SessionLocal, ReplicaSessions, _request_user_id(request))()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    factory = choose_sessionmaker(AsyncSessionLocal, AsyncReplicaSessions, _request_user_id(request))
+    async with factory() as db:
+        yield db
+
+
+def get_async_read_sessionmaker(request: Request):
+    # Streaming responses outlive the request's dependencies, so they open
+    # (and close) their own session from this factory
+    return choose_sessionmaker(AsyncSessionLocal, AsyncReplicaSessions, _request_user_id(request))
+
+
+def _pool_status(pool) -> dict:
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status["size"] = pool.size()
+        status["checked_out"] = pool.checkedout()
+        status["overflow"] = max(pool.overflow(), 0)
+        status["idle"] = pool.checkedin()
+    return status
+
+
+def get_pool_stats() -> dict:
+    stats = pool_stats.snapshot()
+    stats["mode"] = settings.DATABASE_POOL_MODE
+    stats["engines"] = {
+        "sync": _pool_status(engine.pool),
+        "async": _pool_status(async_engine.sync_engine.pool),
+    }
+    return stats
+
+
 def init_db():
-    from app.models import __all_models__  # noqa: F401
+    from app.migrations import is_current, upgrade
 
-    Base.metadata.create_all(bind=engine)
+    if not is_current(engine):
+        upgrade(engine)
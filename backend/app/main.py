@@ -9,6 +9,9 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.config import settings
 from app.database import init_db
+from app.responses import FastJSONResponse
+from app.services.ai_service import clients as ai_clients
+from app.services.generation_jobs import runner as job_runner
 
 logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO),
@@ -18,33 +21,20 @@ logging.basicConfig(
 logger = logging.getLogger("qwizme")
 
 
-def _assign_founder():
-    if not settings.FOUNDER_EMAIL:
-        return
-    from app.database import SessionLocal
-    from app.models.user import User
-    from sqlalchemy import func
-
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(func.lower(User.email) == settings.FOUNDER_EMAIL.lower()).first()
-        if user and user.role != "founder":
-            user.role = "founder"
-            db.commit()
-            logger.info("Assigned founder role to %s", user.email)
-    finally:
-        db.close()
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting Qwiz Me API (env=%s)", settings.ENVIRONMENT)
+    # Founder assignment is a one-off: python -m app.manage assign-founder
     init_db()
-    _assign_founder()
+    job_runner.start()
     yield
+    await job_runner.stop()
+    await ai_clients.aclose()
 
 
-app = FastAPI(title="Qwiz Me API", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="Qwiz Me API", version="1.0.0", lifespan=lifespan, default_response_class=FastJSONResponse
+)
 
 
 # --- Middleware (applied bottom-to-top) ---
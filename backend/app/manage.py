@@ -0,0 +1,107 @@
+"""One-off administrative commands, kept out of the request path.
+
+Run from ``backend/``:
+
+    python -m app.manage migrate
+    python -m app.manage assign-founder [email]
+    python -m app.manage backfill-stats
+    python -m app.manage run-jobs [--concurrency N] [--once]
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import func
+
+from app.config import settings
+
+
+def migrate(engine) -> list[int]:
+    from app.migrations import upgrade
+
+    return upgrade(engine)
+
+
+def assign_founder(db, email: str) -> bool:
+    from app.models.user import User
+
+    user = db.query(User).filter(func.lower(User.email) == email.lower()).first()
+    if user is None:
+        return False
+    if user.role != "founder":
+        user.role = "founder"
+        db.commit()
+    return True
+
+
+def backfill_stats(db) -> None:
+    from app.services.user_stats import recompute_daily_stats, recompute_stats
+
+    db.execute(recompute_stats(db))
+    for stmt in recompute_daily_stats(db):
+        db.execute(stmt)
+    db.commit()
+
+
+def run_jobs(concurrency: int, once: bool = False) -> int:
+    """Run background generation jobs in this process; returns how many ran with ``once``."""
+    import asyncio
+
+    from app.database import AsyncWriteSessionLocal
+    from app.services.generation_jobs import JobRunner
+
+    runner = JobRunner(AsyncWriteSessionLocal, concurrency, settings.GENERATION_JOB_POLL_SECONDS)
+    if once:
+        return asyncio.run(runner.drain())
+    asyncio.run(runner.serve())
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("migrate", help="apply pending schema migrations")
+    founder = commands.add_parser("assign-founder", help="give a registered user the founder role")
+    founder.add_argument("email", nargs="?", default=settings.FOUNDER_EMAIL)
+    commands.add_parser("backfill-stats", help="rebuild dashboard stats and daily progress from attempts")
+    jobs = commands.add_parser("run-jobs", help="run queued image-to-quiz generation jobs")
+    jobs.add_argument("--concurrency", type=int, default=max(settings.GENERATION_WORKERS, 1))
+    jobs.add_argument("--once", action="store_true", help="exit when the queue is empty")
+    args = parser.parse_args(argv)
+
+    from app.database import SessionLocal, engine
+
+    if args.command == "migrate":
+        ran = migrate(engine)
+        print(f"Applied {len(ran)} migration(s)" if ran else "Schema is current")
+        return 0
+
+    if args.command == "run-jobs":
+        ran = run_jobs(args.concurrency, args.once)
+        print(f"Ran {ran} job(s)")
+        return 0
+
+    if args.command == "backfill-stats":
+        db = SessionLocal()
+        try:
+            backfill_stats(db)
+        finally:
+            db.close()
+        print("User stats rebuilt")
+        return 0
+
+    if not args.email:
+        parser.error("no email given and FOUNDER_EMAIL is not set")
+    db = SessionLocal()
+    try:
+        if not assign_founder(db, args.email):
+            print(f"No user registered with {args.email}", file=sys.stderr)
+            return 1
+    finally:
+        db.close()
+    print(f"{args.email} is the founder")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Versioned schema migrations.
+
+Each module in ``app/migrations/versions`` is named ``NNNN_description.py``
+and defines ``upgrade(conn)``. Applied revisions are recorded in the
+``schema_migrations`` table; every revision runs in its own transaction and
+should be idempotent, since revision 1 creates the schema from the current
+models on a fresh database.
+
+``is_current`` answers "is there anything to do?" with a single query, so
+cold starts on an up-to-date database skip reflection and ``create_all``.
+"""
+
+import importlib
+import logging
+import pkgutil
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, exc, func, inspect, select, text
+
+from app.migrations import versions
+
+logger = logging.getLogger("qwizme.migrations")
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("revision", Integer, primary_key=True),
+    Column("description", String(255)),
+    Column("applied_at", DateTime),
+)
+
+
+def _revision_names() -> list[tuple[int, str]]:
+    names = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        number, _, _ = info.name.partition("_")
+        names.append((int(number), info.name))
+    return sorted(names)
+
+
+def discover() -> list[tuple[int, str, object]]:
+    found = []
+    for number, name in _revision_names():
+        description = name.partition("_")[2]
+        module = importlib.import_module(f"{versions.__name__}.{name}")
+        found.append((number, description.replace("_", " "), module))
+    return found
+
+
+def head() -> int:
+    # Read from the module names alone; importing the revisions pulls in every model
+    return _revision_names()[-1][0]
+
+
+def applied_revisions(conn) -> set[int]:
+    if not inspect(conn).has_table(schema_migrations.name):
+        return set()
+    return set(conn.scalars(select(schema_migrations.c.revision)))
+
+
+def current_revision(engine) -> int | None:
+    try:
+        with engine.connect() as conn:
+            return conn.scalar(select(func.max(schema_migrations.c.revision)))
+    except (exc.OperationalError, exc.ProgrammingError):
+        # SQLite and Postgres report a missing table differently
+        return None
+
+
+def is_current(engine) -> bool:
+    revision = current_revision(engine)
+    return revision is not None and revision >= head()
+
+
+def upgrade(engine) -> list[int]:
+    with engine.begin() as conn:
+        _metadata.create_all(conn)
+        applied = applied_revisions(conn)
+
+    ran = []
+    for revision, description, module in discover():
+        if revision in applied:
+            continue
+        with engine.begin() as conn:
+            module.upgrade(conn)
+            conn.execute(
+                schema_migrations.insert().values(
+                    revision=revision,
+                    description=description,
+                    applied_at=datetime.now(timezone.utc),
+                )
+            )
+        logger.info("Applied migration %04d (%s)", revision, description)
+        ran.append(revision)
+    return ran
+
+
+# --- Helpers for revision modules ---
+
+
+def create_index(conn, name: str, table: str, columns: str) -> None:
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+
+def drop_index(conn, name: str) -> None:
+    conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def add_column(conn, table: str, column: str, ddl: str) -> None:
+    existing = {c["name"] for c in inspect(conn).get_columns(table)}
+    if column not in existing:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
@@ -0,0 +1,95 @@
+"""EXPLAIN the hot queries and report any that fall back to a sequential scan.
+
+Run against the configured database with ``python -m app.migrations.plan_check``;
+exits non-zero if any hot query is not served by an index.
+"""
+
+import re
+import sys
+from datetime import datetime
+
+from sqlalchemy import func, select, text, tuple_
+
+from app.models.answer import Answer
+from app.models.question import Question
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.models.verification_code import VerificationCode
+
+_USES_INDEX = re.compile(r"\bUSING (?:COVERING )?INDEX\b")
+
+
+def hot_queries() -> dict:
+    return {
+        "list_quizzes": (
+            select(Quiz.id, Quiz.title, Quiz.created_at)
+            .where(Quiz.user_id == 1, tuple_(Quiz.created_at, Quiz.id) < tuple_(datetime(2100, 1, 1), 1))
+            .order_by(Quiz.created_at.desc(), Quiz.id.desc())
+            .limit(20)
+        ),
+        "question_counts": (
+            select(func.count(Question.id)).where(Question.quiz_id == 1)
+        ),
+        "recent_attempts": (
+            select(QuizAttempt.id, QuizAttempt.score)
+            .where(QuizAttempt.user_id == 1)
+            .order_by(QuizAttempt.completed_at.desc())
+            .limit(10)
+        ),
+        "quiz_scores": (
+            select(QuizAttempt.score, QuizAttempt.total_questions).where(QuizAttempt.quiz_id == 1)
+        ),
+        "score_answers": (
+            select(Answer.question_id, Answer.is_correct)
+            .join(Question, Answer.question_id == Question.id)
+            .where(Question.quiz_id == 1)
+            .order_by(Answer.question_id, Answer.id)
+        ),
+        "latest_verification_code": (
+            select(VerificationCode.id)
+            .where(VerificationCode.user_id == 1, VerificationCode.purpose == "verify-email")
+            .order_by(VerificationCode.created_at.desc())
+            .limit(1)
+        ),
+    }
+
+
+def explain(conn, stmt) -> list[str]:
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        return [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+    # Tiny tables make a seq scan the cheapest plan; only fail when no index can serve the query
+    conn.execute(text("SET LOCAL enable_seqscan = off"))
+    return [row[0] for row in conn.execute(text(f"EXPLAIN {sql}"))]
+
+
+def _is_sequential_scan(line: str) -> bool:
+    line = line.strip()
+    # SQLite also says SCAN when it walks a whole index in order ("SCAN quizzes
+    # USING COVERING INDEX ..."), which is fine; only a bare table scan is not
+    if line.startswith("SCAN "):
+        return _USES_INDEX.search(line) is None
+    return "Seq Scan" in line
+
+
+def find_sequential_scans(engine) -> dict[str, list[str]]:
+    failures = {}
+    with engine.connect() as conn:
+        for name, stmt in hot_queries().items():
+            with conn.begin():
+                plan = explain(conn, stmt)
+            scans = [line for line in plan if _is_sequential_scan(line)]
+            if scans:
+                failures[name] = plan
+    return failures
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    failures = find_sequential_scans(engine)
+    for name, plan in failures.items():
+        print(f"{name} falls back to a sequential scan:")
+        for line in plan:
+            print(f"    {line}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,7 @@
+from app.database import Base
+
+
+def upgrade(conn):
+    from app.models import __all_models__  # noqa: F401
+
+    Base.metadata.create_all(conn)
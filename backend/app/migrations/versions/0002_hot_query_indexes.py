@@ -0,0 +1,8 @@
+from app.migrations import create_index
+
+
+def upgrade(conn):
+    create_index(conn, "ix_quizzes_user_id_created_at", "quizzes", "user_id, created_at DESC")
+    create_index(conn, "ix_quiz_attempts_user_id_completed_at", "quiz_attempts", "user_id, completed_at DESC")
+    create_index(conn, "ix_answers_question_id_id", "answers", "question_id, id")
+    create_index(conn, "ix_verification_codes_user_id_purpose_created_at", "verification_codes", "user_id, purpose, created_at")
@@ -0,0 +1,7 @@
+from app.migrations import create_index, drop_index
+
+
+def upgrade(conn):
+    # list_quizzes pages on (created_at, id); the id tiebreaker makes the index cover the ORDER BY
+    create_index(conn, "ix_quizzes_user_id_created_at_id", "quizzes", "user_id, created_at DESC, id DESC")
+    drop_index(conn, "ix_quizzes_user_id_created_at")
@@ -0,0 +1,5 @@
+from app.migrations import add_column
+
+
+def upgrade(conn):
+    add_column(conn, "users", "quiz_list_version", "INTEGER NOT NULL DEFAULT 0")
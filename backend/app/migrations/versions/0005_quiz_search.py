@@ -0,0 +1,53 @@
+from sqlalchemy import inspect, text
+
+# One FTS5 document per quiz title (rowid 2 * quiz.id + 1) and per question
+# (rowid 2 * question.id), so triggers can delete by rowid. The owner column
+# holds "u<user_id>" and lets MATCH intersect with a user's documents.
+SQLITE_STATEMENTS = (
+    """CREATE VIRTUAL TABLE quiz_search USING fts5(
+        owner, title, question_text, explanation, quiz_id UNINDEXED, tokenize = 'porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS quiz_search_quiz_insert AFTER INSERT ON quizzes BEGIN
+        INSERT INTO quiz_search (rowid, owner, title, quiz_id)
+        VALUES (2 * NEW.id + 1, 'u' || NEW.user_id, NEW.title, NEW.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS quiz_search_quiz_delete AFTER DELETE ON quizzes BEGIN
+        DELETE FROM quiz_search WHERE rowid = 2 * OLD.id + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS quiz_search_question_insert AFTER INSERT ON questions BEGIN
+        INSERT INTO quiz_search (rowid, owner, question_text, explanation, quiz_id)
+        SELECT 2 * NEW.id, 'u' || user_id, NEW.question_text, NEW.explanation, NEW.quiz_id
+        FROM quizzes WHERE id = NEW.quiz_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS quiz_search_question_delete AFTER DELETE ON questions BEGIN
+        DELETE FROM quiz_search WHERE rowid = 2 * OLD.id;
+    END""",
+    """INSERT INTO quiz_search (rowid, owner, title, quiz_id)
+        SELECT 2 * id + 1, 'u' || user_id, title, id FROM quizzes""",
+    """INSERT INTO quiz_search (rowid, owner, question_text, explanation, quiz_id)
+        SELECT 2 * questions.id, 'u' || quizzes.user_id, question_text, explanation, quiz_id
+        FROM questions JOIN quizzes ON quizzes.id = questions.quiz_id""",
+)
+
+POSTGRES_STATEMENTS = (
+    """ALTER TABLE quizzes ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (setweight(to_tsvector('english', coalesce(title, '')), 'A')) STORED""",
+    """ALTER TABLE questions ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(question_text, '')), 'B')
+            || setweight(to_tsvector('english', coalesce(explanation, '')), 'C')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_quizzes_search_vector ON quizzes USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_questions_search_vector ON questions USING GIN (search_vector)",
+)
+
+
+def upgrade(conn):
+    if conn.dialect.name == "sqlite":
+        if inspect(conn).has_table("quiz_search"):
+            return
+        for statement in SQLITE_STATEMENTS:
+            conn.execute(text(statement))
+    elif conn.dialect.name == "postgresql":
+        for statement in POSTGRES_STATEMENTS:
+            conn.execute(text(statement))
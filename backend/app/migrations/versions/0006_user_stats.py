@@ -0,0 +1,7 @@
+def upgrade(conn):
+    from app.models.user_stats import UserStats
+    from app.services.user_stats import recompute_stats
+
+    UserStats.__table__.create(conn, checkfirst=True)
+    # 0001 may have just created the table empty over an existing database
+    conn.execute(recompute_stats(conn))
@@ -0,0 +1,7 @@
+def upgrade(conn):
+    from app.models.daily_stats import UserDailyStats
+    from app.services.user_stats import recompute_daily_stats
+
+    UserDailyStats.__table__.create(conn, checkfirst=True)
+    for statement in recompute_daily_stats(conn):
+        conn.execute(statement)
@@ -0,0 +1,7 @@
+from app.migrations import add_column
+
+
+def upgrade(conn):
+    blob = "BYTEA" if conn.dialect.name == "postgresql" else "BLOB"
+    add_column(conn, "quiz_attempts", "responses", blob)
+    add_column(conn, "quiz_attempts", "response_times", blob)
@@ -0,0 +1,8 @@
+from app.migrations import create_index
+
+
+def upgrade(conn):
+    from app.models.generation_job import GenerationJob
+
+    GenerationJob.__table__.create(conn, checkfirst=True)
+    create_index(conn, "ix_generation_jobs_status_id", "generation_jobs", "status, id")
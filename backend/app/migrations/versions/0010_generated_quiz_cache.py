@@ -0,0 +1,9 @@
+from app.migrations import add_column, create_index
+
+
+def upgrade(conn):
+    from app.models.generated_quiz import GeneratedQuizCache
+
+    add_column(conn, "users", "ai_cache_opt_out", "BOOLEAN NOT NULL DEFAULT FALSE")
+    GeneratedQuizCache.__table__.create(conn, checkfirst=True)
+    create_index(conn, "ix_generated_quiz_cache_last_used_at", "generated_quiz_cache", "last_used_at")
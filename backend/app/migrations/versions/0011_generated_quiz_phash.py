@@ -0,0 +1,5 @@
+from app.migrations import add_column
+
+
+def upgrade(conn):
+    add_column(conn, "generated_quiz_cache", "phash", "BIGINT")
@@ -3,7 +3,33 @@ from app.models.quiz import Quiz
 from app.models.question import Question
 from app.models.answer import Answer
 from app.models.quiz_attempt import QuizAttempt
+from app.models.user_stats import UserStats
+from app.models.daily_stats import UserDailyStats
+from app.models.generation_job import GenerationJob
+from app.models.generated_quiz import GeneratedQuizCache
 from app.models.verification_code import VerificationCode
 
-__all_models__ = [User, Quiz, Question, Answer, QuizAttempt, VerificationCode]
-__all__ = ["User", "Quiz", "Question", "Answer", "QuizAttempt", "VerificationCode"]
+__all_models__ = [
+    User,
+    Quiz,
+    Question,
+    Answer,
+    QuizAttempt,
+    UserStats,
+    UserDailyStats,
+    GenerationJob,
+    GeneratedQuizCache,
+    VerificationCode,
+]
+__all__ = [
+    "User",
+    "Quiz",
+    "Question",
+    "Answer",
+    "QuizAttempt",
+    "UserStats",
+    "UserDailyStats",
+    "GenerationJob",
+    "GeneratedQuizCache",
+    "VerificationCode",
+]
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, ForeignKey, String
+from sqlalchemy import Boolean, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -13,3 +13,6 @@ class Answer(Base):
     is_correct: Mapped[bool] = mapped_column(Boolean, default=False)
 
     question: Mapped["Question"] = relationship(back_populates="answers")  # noqa: F821
+
+
+Index("ix_answers_question_id_id", Answer.question_id, Answer.id)
@@ -0,0 +1,17 @@
+from datetime import date
+
+from sqlalchemy import Float, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class UserDailyStats(Base):
+    """Per-user, per-UTC-day attempt rollups behind GET /stats/timeseries."""
+
+    __tablename__ = "user_daily_stats"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(primary_key=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    percentage_sum: Mapped[float] = mapped_column(Float, default=0.0)
@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, BigInteger, Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class GeneratedQuizCache(Base):
+    """A model-generated quiz keyed by the SHA-256 of the image it came from.
+
+    See app.services.generation_cache.
+    """
+
+    __tablename__ = "generated_quiz_cache"
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    quiz_data: Mapped[dict] = mapped_column(JSON)
+    image_ref: Mapped[str] = mapped_column(Text)
+    # Signed 64-bit dHash of the image, for near-duplicate lookups (app.services.image_index)
+    phash: Mapped[int | None] = mapped_column(BigInteger, default=None)
+    hits: Mapped[int] = mapped_column(default=0)
+    created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+    last_used_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+
+
+# Eviction drops the least recently used entries
+Index("ix_generated_quiz_cache_last_used_at", GeneratedQuizCache.last_used_at)
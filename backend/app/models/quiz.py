@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -19,3 +19,6 @@ class Quiz(Base):
     user: Mapped["User"] = relationship(back_populates="quizzes")  # noqa: F821
     questions: Mapped[list["Question"]] = relationship(back_populates="quiz", cascade="all, delete-orphan")  # noqa: F821
     attempts: Mapped[list["QuizAttempt"]] = relationship(back_populates="quiz", cascade="all, delete-orphan")  # noqa: F821
+
+
+Index("ix_quizzes_user_id_created_at_id", Quiz.user_id, Quiz.created_at.desc(), Quiz.id.desc())
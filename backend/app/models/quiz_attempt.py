@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -15,6 +15,12 @@ class QuizAttempt(Base):
     score: Mapped[int] = mapped_column()
     total_questions: Mapped[int] = mapped_column()
     completed_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+    # Packed per-question data; see app.services.attempt_responses
+    responses: Mapped[bytes | None] = mapped_column(LargeBinary, default=None)
+    response_times: Mapped[bytes | None] = mapped_column(LargeBinary, default=None)
 
     user: Mapped["User"] = relationship(back_populates="attempts")  # noqa: F821
     quiz: Mapped["Quiz"] = relationship(back_populates="attempts")  # noqa: F821
+
+
+Index("ix_quiz_attempts_user_id_completed_at", QuizAttempt.user_id, QuizAttempt.completed_at.desc())
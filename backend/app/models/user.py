@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, ForeignKey, Integer, String, Text, false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -16,6 +16,8 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
     ai_provider: Mapped[str | None] = mapped_column(String(20), nullable=True)
     ai_api_key_encrypted: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
+    # Keep uploads out of the shared generated-quiz cache (app.services.generation_cache)
+    ai_cache_opt_out: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false())
     is_verified: Mapped[bool] = mapped_column(Boolean, default=False)
     first_name: Mapped[str | None] = mapped_column(String(100), nullable=True)
     last_name: Mapped[str | None] = mapped_column(String(100), nullable=True)
@@ -24,6 +26,7 @@ class User(Base):
     pending_email: Mapped[str | None] = mapped_column(String(255), nullable=True)
     profile_picture: Mapped[str | None] = mapped_column(String(500), nullable=True)
     created_by_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
+    quiz_list_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")  # bumped on quiz create/delete
 
     quizzes: Mapped[list["Quiz"]] = relationship(back_populates="user", cascade="all, delete-orphan")  # noqa: F821
     attempts: Mapped[list["QuizAttempt"]] = relationship(back_populates="user", cascade="all, delete-orphan")  # noqa: F821
@@ -0,0 +1,16 @@
+from sqlalchemy import Float, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class UserStats(Base):
+    """Running totals behind GET /stats, updated alongside the rows they summarize."""
+
+    __tablename__ = "user_stats"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    quizzes_created: Mapped[int] = mapped_column(Integer, default=0)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    percentage_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    best_percentage: Mapped[float] = mapped_column(Float, default=0.0)
@@ -0,0 +1,57 @@
+"""Fast JSON responses.
+
+``FastJSONResponse`` is the app-wide default response class: plain payloads
+are rendered with orjson and Pydantic models straight from pydantic-core.
+
+``FastRoute`` skips FastAPI's response_model round trip (dump to dict,
+validate again, encode) when a handler already returns an instance of
+exactly its ``response_model``; anything else, such as ORM objects or
+dicts, is still validated and filtered as usual.
+"""
+
+import asyncio
+from typing import Any, Callable
+
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.responses import Response
+
+
+class FastJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
+
+
+def _model_response(result: Any, model: type, status_code: int | None, values: dict) -> Any:
+    if type(result) is not model:
+        return result
+    # Carry over what the handler set on an injected Response, as FastAPI would
+    sub_response = next((v for v in values.values() if isinstance(v, Response)), None)
+    if sub_response is not None and sub_response.status_code:
+        status_code = sub_response.status_code
+    response = FastJSONResponse(result, status_code=status_code or 200)
+    if sub_response is not None:
+        response.headers.raw.extend(sub_response.headers.raw)
+    return response
+
+
+def _skip_revalidation(call: Callable, model: type, status_code: int | None) -> Callable:
+    if asyncio.iscoroutinefunction(call):
+        async def endpoint(**values):
+            return _model_response(await call(**values), model, status_code, values)
+    else:
+        def endpoint(**values):
+            return _model_response(call(**values), model, status_code, values)
+    return endpoint
+
+
+class FastRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable, **kwargs: Any):
+        super().__init__(path, endpoint, **kwargs)
+        model = self.response_model
+        if isinstance(model, type) and issubclass(model, BaseModel):
+            # The request handler built above reads dependant.call on every request
+            self.dependant.call = _skip_revalidation(self.dependant.call, model, self.status_code)
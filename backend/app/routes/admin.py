@@ -6,9 +6,10 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.auth.dependencies import require_admin, require_founder
-from app.database import get_db
+from app.database import get_db, get_pool_stats, get_read_db
 from app.limiter import limiter
 from app.models.user import User
+from app.responses import FastRoute
 from app.schemas.admin import (
     AdminAccountResponse,
     CreateAccountBulkRequest,
@@ -16,10 +17,11 @@ from app.schemas.admin import (
     PromoteRequest,
 )
 from app.schemas.auth import UserResponse
+from app.services.response_cache import quiz_analytics, quiz_details
 
 logger = logging.getLogger("qwizme.admin")
 
-router = APIRouter(prefix="/admin", tags=["admin"])
+router = APIRouter(prefix="/admin", tags=["admin"], route_class=FastRoute)
 
 
 @router.post("/accounts", response_model=AdminAccountResponse, status_code=status.HTTP_201_CREATED)
@@ -94,7 +96,7 @@ def create_accounts_bulk(
 @router.get("/accounts", response_model=list[AdminAccountResponse])
 def list_accounts(
     status_filter: str | None = Query(None, alias="status"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin: User = Depends(require_admin),
 ):
     query = db.query(User).filter(User.created_by_id.isnot(None))
@@ -144,7 +146,16 @@ def promote_user(
 
 @router.get("/users", response_model=list[UserResponse])
 def list_users(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     founder: User = Depends(require_founder),
 ):
     return db.query(User).order_by(User.created_at.desc()).all()
+
+
+@router.get("/metrics")
+def get_metrics(admin: User = Depends(require_admin)):
+    return {
+        "db_pool": get_pool_stats(),
+        "quiz_detail_cache": quiz_details.snapshot(),
+        "quiz_analytics_cache": quiz_analytics.snapshot(),
+    }
@@ -1,115 +1,180 @@
+import asyncio
 import logging
-import os
-import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, UploadFile, File, Form, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.dependencies import get_current_active_user
+from app.auth.dependencies import get_current_active_user_async
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db, get_async_read_db, get_async_read_sessionmaker, get_async_write_db
 from app.limiter import limiter
-from app.models.answer import Answer
-from app.models.question import Question
-from app.models.quiz import Quiz
+from app.models.generation_job import GenerationJob
 from app.models.user import User
-from app.schemas.quiz import QuizResponse
-from app.services.mock_ai import generate_quiz_from_image
+from app.responses import FastRoute
+from app.schemas.job import GenerationJobResponse
+from app.schemas.quiz import QuizResponse, SimilarQuiz, SimilarQuizResponse
+from app.services.generation import (
+    ALLOWED_TYPES,
+    GenerationError,
+    find_near_duplicate,
+    new_image_filename,
+    run_generation,
+    save_generated_quiz,
+    start_generation,
+)
+from app.services.generation_jobs import TERMINAL, enqueue_job, runner
 
 logger = logging.getLogger("qwizme.ai")
 
-router = APIRouter(prefix="/quizzes", tags=["ai-generate"])
+router = APIRouter(prefix="/quizzes", tags=["ai-generate"], route_class=FastRoute)
 
-UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
+JOB_EVENTS_POLL_SECONDS = 1.0
+JOB_EVENTS_KEEPALIVE_SECONDS = 15.0
 
 
-@router.post("/generate-from-image", response_model=QuizResponse)
-@limiter.limit("10/hour")
-async def generate_from_image(
-    request: Request,
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-):
-    ALLOWED_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
+async def _read_image(file: UploadFile) -> tuple[bytes, str]:
     if not file.content_type or file.content_type not in ALLOWED_TYPES:
         raise HTTPException(status_code=400, detail="Only JPEG, PNG, WebP, and GIF images are allowed")
-
     contents = await file.read()
     if len(contents) > settings.MAX_UPLOAD_SIZE:
         raise HTTPException(status_code=400, detail="File too large (max 10MB)")
+    return contents, file.content_type
 
-    media_type = file.content_type or "image/png"
-    ALLOWED_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
-    ext = os.path.splitext(file.filename or "image.png")[1].lower()
-    if ext not in ALLOWED_EXTS:
-        ext = ".png"
-    filename = f"{uuid.uuid4().hex}{ext}"
-
-    # Store image: Supabase in production, local in dev
-    if settings.SUPABASE_URL and settings.SUPABASE_SERVICE_KEY:
-        try:
-            from app.services.storage import upload_to_supabase
-            image_ref = upload_to_supabase(filename, contents, media_type)
-        except Exception as e:
-            logger.error("Supabase upload failed: %s", e)
-            raise HTTPException(status_code=500, detail="Failed to store image")
-    else:
-        filepath = os.path.join(UPLOAD_DIR, filename)
-        os.makedirs(UPLOAD_DIR, exist_ok=True)
-        with open(filepath, "wb") as f:
-            f.write(contents)
-        image_ref = filename
-
-    # Generate quiz: real AI if user has key configured, else mock
-    if current_user.ai_provider and current_user.ai_api_key_encrypted:
-        try:
-            from app.services.encryption import decrypt_value
-            from app.services.ai_service import generate_quiz
-            api_key = decrypt_value(current_user.ai_api_key_encrypted)
-            quiz_data = generate_quiz(contents, media_type, current_user.ai_provider, api_key)
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail="AI configuration error — check your API key in Settings")
-        except Exception as e:
-            logger.error("AI generation failed: %s", e)
-            raise HTTPException(status_code=502, detail="AI service error — check your API key and try again")
-    else:
-        quiz_data = generate_quiz_from_image(filename)
-
-    quiz = Quiz(
-        user_id=current_user.id,
-        title=quiz_data["title"],
-        source_type="ai_generated",
-        image_filename=image_ref,
-    )
-    db.add(quiz)
-    db.flush()
-
-    for q_data in quiz_data["questions"]:
-        question = Question(
-            quiz_id=quiz.id,
-            question_text=q_data["question_text"],
-            explanation=q_data["explanation"],
-            correct_answer_index=q_data["correct_answer_index"],
-        )
-        db.add(question)
-        db.flush()
-
-        for a_data in q_data["answers"]:
-            answer = Answer(
-                question_id=question.id,
-                answer_text=a_data["text"],
-                is_correct=a_data["is_correct"],
-            )
-            db.add(answer)
-
-    db.commit()
-    db.refresh(quiz)
+
+@router.post("/similar", response_model=SimilarQuizResponse)
+@limiter.limit("30/hour")
+async def find_similar_quiz(
+    request: Request,
+    file: UploadFile = File(...),
+    read_db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async),
+):
+    """A quiz already generated from a near-duplicate of this image, if any.
+
+    Near matches can be wrong, so the client offers it and, if accepted,
+    sends its ``content_hash`` as ``reuse`` to ``generate-from-image``.
+    """
+    contents, _ = await _read_image(file)
+    found = await find_near_duplicate(read_db, current_user.id, contents)
+    if found is None:
+        return SimilarQuizResponse(match=None)
+    distance, entry = found
+    return SimilarQuizResponse(match=SimilarQuiz(
+        content_hash=entry.content_hash,
+        title=entry.quiz_data["title"],
+        question_count=len(entry.quiz_data["questions"]),
+        distance=distance,
+    ))
+
+
+@router.post("/generate-from-image", response_model=QuizResponse)
+@limiter.limit("10/hour")
+async def generate_from_image(
+    request: Request,
+    file: UploadFile = File(...),
+    reuse: str | None = Form(None, pattern=r"^[0-9a-f]{64}$", description="content_hash from /quizzes/similar"),
+    db: AsyncSession = Depends(get_async_write_db),
+    read_db: AsyncSession = Depends(get_async_read_db),
+    auth_db: AsyncSession = Depends(get_async_db),  # the session that loaded current_user
+    current_user: User = Depends(get_current_active_user_async),
+):
+    contents, media_type = await _read_image(file)
+    # Read through the read session; the write session would start
+    # SQLite's write transaction before the model call
+    generation = await start_generation(read_db, current_user.id, contents, reuse)
+    # Return both connections to the pool for the model call; the write
+    # session only checks one out to save the quiz
+    await read_db.close()
+    await auth_db.close()
+    try:
+        await run_generation(generation, contents, media_type, file.filename)
+    except GenerationError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    quiz = await save_generated_quiz(db, current_user.id, generation)
+    await db.commit()
 
     return QuizResponse(
         id=quiz.id,
         title=quiz.title,
         source_type=quiz.source_type,
-        question_count=len(quiz_data["questions"]),
+        question_count=len(generation.quiz_data["questions"]),
         created_at=quiz.created_at,
     )
+
+
+@router.post("/jobs", response_model=GenerationJobResponse, status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit("10/hour")
+async def create_generation_job(
+    request: Request,
+    response: Response,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_write_db),
+    current_user: User = Depends(get_current_active_user_async),
+):
+    """Queue an image-to-quiz generation and return at once.
+
+    Follow it with ``GET /quizzes/jobs/{id}`` or the ``/events`` stream.
+    """
+    contents, media_type = await _read_image(file)
+    job = await enqueue_job(db, current_user.id, new_image_filename(file.filename), media_type, contents)
+    runner.notify()
+    response.headers["Location"] = f"{request.url.path}/{job.id}"
+    return GenerationJobResponse.model_validate(job)
+
+
+async def _get_job(db: AsyncSession, job_id: int, user_id: int) -> GenerationJob | None:
+    return await db.scalar(select(GenerationJob).where(GenerationJob.id == job_id, GenerationJob.user_id == user_id))
+
+
+@router.get("/jobs/{job_id}", response_model=GenerationJobResponse)
+async def get_generation_job(
+    request: Request,
+    job_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async),
+):
+    job = await _get_job(db, job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return GenerationJobResponse.model_validate(job)
+
+
+async def _job_events(request: Request, factory, job_id: int, user_id: int):
+    last, idle = None, 0.0
+    while True:
+        async with factory() as db:
+            job = await _get_job(db, job_id, user_id)
+        if job is None:
+            return
+        current = GenerationJobResponse.model_validate(job)
+        if current != last:
+            yield f"event: status\ndata: {current.model_dump_json()}\n\n"
+            last, idle = current, 0.0
+        elif idle >= JOB_EVENTS_KEEPALIVE_SECONDS:
+            yield ": keep-alive\n\n"
+            idle = 0.0
+        if job.status in TERMINAL or await request.is_disconnected():
+            return
+        await asyncio.sleep(JOB_EVENTS_POLL_SECONDS)
+        idle += JOB_EVENTS_POLL_SECONDS
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_generation_job(
+    request: Request,
+    job_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    factory=Depends(get_async_read_sessionmaker),
+    current_user: User = Depends(get_current_active_user_async),
+):
+    """Server-sent ``status`` events on every change until the job finishes."""
+    if await _get_job(db, job_id, current_user.id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        _job_events(request, factory, job_id, current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
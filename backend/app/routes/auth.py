@@ -10,6 +10,7 @@ from app.auth.passwords import hash_password, verify_password
 from app.database import get_db
 from app.limiter import limiter
 from app.models.user import User
+from app.responses import FastRoute
 from app.schemas.auth import (
     ForgotPasswordRequest,
     ResetPasswordRequest,
@@ -23,7 +24,7 @@ from app.schemas.settings import ConfirmEmailChangeRequest
 
 logger = logging.getLogger("qwizme")
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=FastRoute)
 
 
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
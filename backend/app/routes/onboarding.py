@@ -12,6 +12,7 @@ from app.auth.passwords import hash_password
 from app.database import get_db
 from app.limiter import limiter
 from app.models.user import User
+from app.responses import FastRoute
 from app.schemas.auth import Token
 from app.schemas.onboarding import (
     ClaimAccountRequest,
@@ -22,7 +23,7 @@ from app.schemas.onboarding import (
 
 logger = logging.getLogger("qwizme.onboarding")
 
-router = APIRouter(prefix="/onboarding", tags=["onboarding"])
+router = APIRouter(prefix="/onboarding", tags=["onboarding"], route_class=FastRoute)
 
 
 def _generate_username(db: Session, first_name: str, last_name: str) -> str:
@@ -1,19 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload, selectinload
+import base64
+from datetime import datetime, timezone
 
-from app.auth.dependencies import get_current_active_user
-from app.database import get_db
+import orjson
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+
+from app.auth.dependencies import get_current_active_user, get_current_active_user_async
+from app.conditional import CACHE_HEADERS, etag_matches, not_modified, set_etag
+from app.database import get_async_read_db, get_async_read_sessionmaker, get_async_write_db, get_write_db
 from app.limiter import limiter
 from app.models.answer import Answer
 from app.models.question import Question
 from app.models.quiz import Quiz
 from app.models.quiz_attempt import QuizAttempt
 from app.models.user import User
-from app.schemas.attempt import AttemptResponse, AttemptSubmit
-from app.schemas.quiz import QuizCreate, QuizDetail, QuizListResponse, QuizResponse
+from app.responses import FastRoute
+from app.schemas.attempt import (
+    AttemptBatchResponse,
+    AttemptBatchResult,
+    AttemptBatchSubmit,
+    AttemptResponse,
+    AttemptSubmit,
+    QuizAnalytics,
+)
+from app.schemas.quiz import (
+    QuizCreate,
+    QuizDetail,
+    QuizImport,
+    QuizImportError,
+    QuizImportResponse,
+    QuizListResponse,
+    QuizResponse,
+)
+from app.services.answer_keys import answer_keys, get_answer_key, get_answer_keys
+from app.services.attempt_responses import pack_response_times, pack_responses
+from app.services.quiz_store import add_quiz, bump_quiz_list_version
+from app.services.quiz_analytics import quiz_analytics
+from app.services.response_cache import quiz_analytics as analytics_cache, quiz_details
+from app.services.search import search_quiz_ids
+from app.services.user_stats import (
+    attempt_percentage,
+    recompute_daily_stats,
+    recompute_stats,
+    record_daily_stats,
+    record_stats,
+)
+
+router = APIRouter(prefix="/quizzes", tags=["quizzes"], route_class=FastRoute)
+
+EXPORT_YIELD_PER = 1000
+IMPORT_CHUNK_SIZE = 100  # quizzes per commit
+IMPORT_MAX_LINE_BYTES = 4 * 1024 * 1024
+IMPORT_MAX_ERRORS = 100
 
-router = APIRouter(prefix="/quizzes", tags=["quizzes"])
+
+def _question_rows(questions) -> list[dict]:
+    return [
+        {
+            "question_text": q.question_text,
+            "explanation": q.explanation,
+            "correct_answer_index": (
+                q.correct_answer_index
+                if getattr(q, "correct_answer_index", None) is not None
+                else next((i for i, a in enumerate(q.answers) if a.is_correct), 0)
+            ),
+            "answers": [{"text": a.answer_text, "is_correct": a.is_correct} for a in q.answers],
+        }
+        for q in questions
+    ]
 
 
 @router.post("", response_model=QuizResponse, status_code=status.HTTP_201_CREATED)
@@ -21,38 +81,10 @@ router = APIRouter(prefix="/quizzes", tags=["quizzes"])
 def create_quiz(
     request: Request,
     data: QuizCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    quiz = Quiz(
-        user_id=current_user.id,
-        title=data.title,
-        source_type="manual",
-    )
-    db.add(quiz)
-    db.flush()
-
-    for q_data in data.questions:
-        correct_index = next(
-            (i for i, a in enumerate(q_data.answers) if a.is_correct), 0
-        )
-        question = Question(
-            quiz_id=quiz.id,
-            question_text=q_data.question_text,
-            explanation=q_data.explanation,
-            correct_answer_index=correct_index,
-        )
-        db.add(question)
-        db.flush()
-
-        for answer_data in q_data.answers:
-            answer = Answer(
-                question_id=question.id,
-                answer_text=answer_data.answer_text,
-                is_correct=answer_data.is_correct,
-            )
-            db.add(answer)
-
+    quiz = add_quiz(db, current_user.id, data.title, "manual", _question_rows(data.questions))
     db.commit()
     db.refresh(quiz)
 
@@ -65,54 +97,310 @@ def create_quiz(
     )
 
 
+def _quiz_summaries():
+    question_count = (
+        select(func.count(Question.id)).where(Question.quiz_id == Quiz.id).correlate(Quiz).scalar_subquery()
+    )
+    return select(Quiz.id, Quiz.title, Quiz.source_type, Quiz.created_at, question_count.label("question_count"))
+
+
+def _encode_cursor(created_at: datetime, quiz_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{quiz_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, _, quiz_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+        return datetime.fromisoformat(created_at), int(quiz_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("", response_model=QuizListResponse)
-def list_quizzes(
+async def list_quizzes(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    cursor: str | None = Query(None, description="Keyset cursor; pass an empty value for the first page"),
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async),
 ):
-    total = db.query(func.count(Quiz.id)).filter(Quiz.user_id == current_user.id).scalar() or 0
-    quizzes = (
-        db.query(Quiz)
-        .options(selectinload(Quiz.questions))
-        .filter(Quiz.user_id == current_user.id)
-        .order_by(Quiz.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    # Every quiz create and delete bumps the version. It is read from the same
+    # (possibly lagging) database as the rows, and before them, so a tag never
+    # names a newer version than the list it was sent with.
+    version = await db.scalar(select(User.quiz_list_version).where(User.id == current_user.id))
+    etag = f'W/"l{current_user.id}-{version}"'
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    stmt = (
+        _quiz_summaries()
+        .where(Quiz.user_id == current_user.id)
+        .order_by(Quiz.created_at.desc(), Quiz.id.desc())
+        .limit(limit + 1)
     )
+    if cursor:
+        stmt = stmt.where(tuple_(Quiz.created_at, Quiz.id) < tuple_(*_decode_cursor(cursor)))
+    elif cursor is None:
+        stmt = stmt.offset(skip)
+
+    rows = (await db.execute(stmt)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    total = None
+    if include_total:
+        total = await db.scalar(select(func.count(Quiz.id)).where(Quiz.user_id == current_user.id)) or 0
+
+    set_etag(response, etag)
     return QuizListResponse(
         quizzes=[
             QuizResponse(
-                id=q.id,
-                title=q.title,
-                source_type=q.source_type,
-                question_count=len(q.questions),
-                created_at=q.created_at,
+                id=r.id,
+                title=r.title,
+                source_type=r.source_type,
+                question_count=r.question_count,
+                created_at=r.created_at,
             )
-            for q in quizzes
+            for r in rows
         ],
         total=total,
-        has_more=skip + limit < total,
+        has_more=has_more,
+        next_cursor=_encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None,
+    )
+
+
+async def _export_lines(factory, user_id: int):
+    stmt = (
+        select(
+            Quiz.id.label("quiz_id"),
+            Quiz.title,
+            Quiz.source_type,
+            Quiz.created_at,
+            Question.id.label("question_id"),
+            Question.question_text,
+            Question.explanation,
+            Question.correct_answer_index,
+            Answer.answer_text,
+            Answer.is_correct,
+        )
+        .outerjoin(Question, Question.quiz_id == Quiz.id)
+        .outerjoin(Answer, Answer.question_id == Question.id)
+        .where(Quiz.user_id == user_id)
+        .order_by(Quiz.id, Question.id, Answer.id)
+        .execution_options(yield_per=EXPORT_YIELD_PER)
+    )
+    # Rows arrive grouped by quiz, so only the quiz being assembled is held in memory
+    quiz, quiz_id, question_id = None, None, None
+    async with factory() as db:
+        result = await db.stream(stmt)
+        async for row in result:
+            if row.quiz_id != quiz_id:
+                if quiz is not None:
+                    yield orjson.dumps(quiz) + b"\n"
+                quiz_id, question_id = row.quiz_id, None
+                quiz = {
+                    "title": row.title,
+                    "source_type": row.source_type,
+                    "created_at": row.created_at,
+                    "questions": [],
+                }
+            if row.question_id is None:
+                continue
+            if row.question_id != question_id:
+                question_id = row.question_id
+                quiz["questions"].append({
+                    "question_text": row.question_text,
+                    "explanation": row.explanation,
+                    "correct_answer_index": row.correct_answer_index,
+                    "answers": [],
+                })
+            if row.answer_text is not None:
+                quiz["questions"][-1]["answers"].append({"answer_text": row.answer_text, "is_correct": row.is_correct})
+    if quiz is not None:
+        yield orjson.dumps(quiz) + b"\n"
+
+
+@router.get("/export")
+@limiter.limit("10/hour")
+async def export_quizzes(
+    request: Request,
+    factory=Depends(get_async_read_sessionmaker),
+    current_user: User = Depends(get_current_active_user_async),
+):
+    """Stream the user's whole quiz library as NDJSON, one quiz per line."""
+    return StreamingResponse(
+        _export_lines(factory, current_user.id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="qwizme-quizzes.ndjson"'},
     )
 
 
+async def _ndjson_lines(request: Request):
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+        if len(buffer) > IMPORT_MAX_LINE_BYTES:
+            raise HTTPException(status_code=413, detail="Import line too long")
+    if buffer:
+        yield buffer
+
+
+def _format_validation_error(e: ValidationError) -> str:
+    error = e.errors()[0]
+    location = ".".join(str(part) for part in error["loc"])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+def _add_imported(db: Session, user_id: int, quizzes: list[QuizImport]) -> None:
+    for quiz in quizzes:
+        add_quiz(
+            db, user_id, quiz.title, quiz.source_type, _question_rows(quiz.questions), created_at=quiz.created_at
+        )
+
+
+@router.post("/import", response_model=QuizImportResponse)
+@limiter.limit("5/hour")
+async def import_quizzes(
+    request: Request,
+    db: AsyncSession = Depends(get_async_write_db),
+    current_user: User = Depends(get_current_active_user_async),
+):
+    """Import an NDJSON quiz library, committing every IMPORT_CHUNK_SIZE quizzes.
+
+    Invalid lines are skipped and reported; quizzes committed before a
+    failure stay imported.
+    """
+    imported, errors, pending = 0, [], []
+    line_number = 0
+    async for line in _ndjson_lines(request):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            pending.append(QuizImport.model_validate_json(line))
+        except ValidationError as e:
+            if len(errors) < IMPORT_MAX_ERRORS:
+                errors.append(QuizImportError(line=line_number, error=_format_validation_error(e)))
+            continue
+        # Write whole parsed chunks so SQLite's write lock is never held across network reads
+        if len(pending) >= IMPORT_CHUNK_SIZE:
+            await db.run_sync(_add_imported, current_user.id, pending)
+            await db.commit()
+            imported += len(pending)
+            pending = []
+    if pending:
+        await db.run_sync(_add_imported, current_user.id, pending)
+        await db.commit()
+        imported += len(pending)
+    return QuizImportResponse(imported=imported, errors=errors)
+
+
+@router.get("/search", response_model=QuizListResponse)
+@limiter.limit("120/minute")
+async def search_quizzes(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async),
+):
+    """Rank the user's quizzes by how well their title, questions and explanations match ``q``."""
+    quiz_ids = await search_quiz_ids(db, current_user.id, q, limit + 1, skip)
+    has_more = len(quiz_ids) > limit
+    quiz_ids = quiz_ids[:limit]
+    rows = {r.id: r for r in (await db.execute(_quiz_summaries().where(Quiz.id.in_(quiz_ids)))).all()}
+    return QuizListResponse(
+        quizzes=[
+            QuizResponse(
+                id=r.id,
+                title=r.title,
+                source_type=r.source_type,
+                question_count=r.question_count,
+                created_at=r.created_at,
+            )
+            for r in (rows[quiz_id] for quiz_id in quiz_ids if quiz_id in rows)
+        ],
+        total=None,
+        has_more=has_more,
+    )
+
+
+def _quiz_etag(quiz_id: int, created_at: datetime) -> str:
+    # Quizzes are immutable once created, so identity and creation time are the content version
+    return f'"q{quiz_id}-{created_at.timestamp():.6f}"'
+
+
+def _cached_response(etag: str, body: bytes) -> Response:
+    return Response(content=body, media_type="application/json", headers={"ETag": etag, **CACHE_HEADERS})
+
+
 @router.get("/{quiz_id}", response_model=QuizDetail)
-def get_quiz(
+async def get_quiz(
+    request: Request,
     quiz_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async),
 ):
-    quiz = (
-        db.query(Quiz)
-        .options(joinedload(Quiz.questions).joinedload(Question.answers))
-        .filter(Quiz.id == quiz_id, Quiz.user_id == current_user.id)
-        .first()
+    cached = quiz_details.get(quiz_id)
+    if cached is not None and cached.user_id == current_user.id:
+        if etag_matches(request, cached.etag):
+            return not_modified(cached.etag)
+        return _cached_response(cached.etag, cached.body)
+
+    created_at = await db.scalar(
+        select(Quiz.created_at).where(Quiz.id == quiz_id, Quiz.user_id == current_user.id)
     )
+    if created_at is None:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    etag = _quiz_etag(quiz_id, created_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    quiz = (
+        await db.scalars(
+            select(Quiz)
+            .options(joinedload(Quiz.questions).joinedload(Question.answers))
+            .where(Quiz.id == quiz_id, Quiz.user_id == current_user.id)
+        )
+    ).unique().first()
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
-    return quiz
+    body = QuizDetail.model_validate(quiz).model_dump_json().encode()
+    quiz_details.put(quiz_id, current_user.id, etag, body)
+    return _cached_response(etag, body)
+
+
+@router.get("/{quiz_id}/analytics", response_model=QuizAnalytics)
+@limiter.limit("30/minute")
+async def get_quiz_analytics(
+    request: Request,
+    quiz_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async),
+):
+    """Score distribution and per-question correctness, cached until the quiz's next attempt."""
+    cached = analytics_cache.get(quiz_id)
+    if cached is not None and cached.user_id == current_user.id:
+        if etag_matches(request, cached.etag):
+            return not_modified(cached.etag)
+        return _cached_response(cached.etag, cached.body)
+
+    key = await get_answer_key(db, quiz_id)
+    if key is None or key.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    analytics = await quiz_analytics(db, quiz_id, key)
+    # Attempts are only ever added to a live quiz, so their count versions the result
+    etag = f'"a{quiz_id}-{analytics.attempts}"'
+    body = analytics.__pydantic_serializer__.to_json(analytics)
+    analytics_cache.put(quiz_id, current_user.id, etag, body)
+    return _cached_response(etag, body)
 
 
 @router.delete("/{quiz_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -120,64 +408,158 @@ def get_quiz(
 def delete_quiz(
     request: Request,
     quiz_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     current_user: User = Depends(get_current_active_user),
 ):
     quiz = db.query(Quiz).filter(Quiz.id == quiz_id, Quiz.user_id == current_user.id).first()
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
     db.delete(quiz)
+    db.flush()
+    bump_quiz_list_version(db, current_user.id)
+    db.execute(recompute_stats(db, current_user.id))
+    for stmt in recompute_daily_stats(db, current_user.id):
+        db.execute(stmt)
     db.commit()
+    answer_keys.invalidate(quiz_id)
+    quiz_details.invalidate(quiz_id)
+    analytics_cache.invalidate(quiz_id)
 
 
 @router.post("/{quiz_id}/submit", response_model=AttemptResponse)
 @limiter.limit("60/hour")
-def submit_quiz(
+async def submit_quiz(
     request: Request,
     quiz_id: int,
     data: AttemptSubmit,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_write_db),
+    current_user: User = Depends(get_current_active_user_async),
 ):
-    quiz = (
-        db.query(Quiz)
-        .options(joinedload(Quiz.questions).joinedload(Question.answers))
-        .filter(Quiz.id == quiz_id, Quiz.user_id == current_user.id)
-        .first()
-    )
-    if not quiz:
+    key = await get_answer_key(db, quiz_id)
+    if key is None or key.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Quiz not found")
 
-    questions = sorted(quiz.questions, key=lambda q: q.id)
-
-    if len(data.answers) != len(questions):
+    if len(data.answers) != len(key.correct):
         raise HTTPException(
             status_code=400,
-            detail=f"Expected {len(questions)} answers, got {len(data.answers)}",
+            detail=f"Expected {len(key.correct)} answers, got {len(data.answers)}",
         )
 
-    score = 0
-    for question, selected_index in zip(questions, data.answers):
-        answers = sorted(question.answers, key=lambda a: a.id)
-        if 0 <= selected_index < len(answers) and answers[selected_index].is_correct:
-            score += 1
-
     attempt = QuizAttempt(
         user_id=current_user.id,
-        quiz_id=quiz.id,
-        score=score,
-        total_questions=len(questions),
+        quiz_id=quiz_id,
+        score=key.score(data.answers),
+        total_questions=len(key.correct),
+        completed_at=datetime.now(timezone.utc),
+        responses=pack_responses(data.answers),
+        response_times=pack_response_times(data.response_times_ms),
     )
     db.add(attempt)
-    db.commit()
-    db.refresh(attempt)
+    percentage = attempt_percentage(attempt.score, attempt.total_questions)
+    try:
+        # The attempt is inserted at commit, so a vanished quiz fails there
+        await db.execute(record_stats(db, current_user.id, percentages=[percentage]))
+        await db.execute(record_daily_stats(db, current_user.id, [(attempt.completed_at, percentage)]))
+        await db.commit()
+    except IntegrityError:
+        # Deleted through another worker whose cache invalidation we never saw
+        await db.rollback()
+        answer_keys.invalidate(quiz_id)
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    analytics_cache.invalidate(quiz_id)
+    await db.refresh(attempt)
 
     return AttemptResponse(
         id=attempt.id,
-        quiz_id=quiz.id,
-        quiz_title=quiz.title,
+        quiz_id=quiz_id,
+        quiz_title=key.title,
         score=attempt.score,
         total_questions=attempt.total_questions,
         percentage=round(attempt.score / attempt.total_questions * 100, 1) if attempt.total_questions > 0 else 0,
         completed_at=attempt.completed_at,
     )
+
+
+def _score_batch(items, keys: dict, user_id: int) -> tuple[list[tuple[int, str]], list[tuple[int, dict]]]:
+    errors, rows = [], []
+    now = datetime.now(timezone.utc)
+    for index, item in enumerate(items):
+        key = keys.get(item.quiz_id)
+        if key is None or key.user_id != user_id:
+            errors.append((index, "Quiz not found"))
+            continue
+        if len(item.answers) != len(key.correct):
+            errors.append((index, f"Expected {len(key.correct)} answers, got {len(item.answers)}"))
+            continue
+        completed_at = item.completed_at or now
+        if completed_at.tzinfo is None:
+            completed_at = completed_at.replace(tzinfo=timezone.utc)
+        else:
+            # SQLite keeps the wall-clock time and drops the offset
+            completed_at = completed_at.astimezone(timezone.utc)
+        rows.append((index, {
+            "user_id": user_id,
+            "quiz_id": item.quiz_id,
+            "score": key.score(item.answers),
+            "total_questions": len(key.correct),
+            "completed_at": min(completed_at, now),
+            "responses": pack_responses(item.answers),
+            "response_times": pack_response_times(item.response_times_ms),
+        }))
+    return errors, rows
+
+
+async def _insert_attempts(db: AsyncSession, rows: list[tuple[int, dict]]) -> list[int]:
+    if not rows:
+        return []
+    stmt = insert(QuizAttempt).returning(QuizAttempt.id, sort_by_parameter_order=True)
+    attempt_ids = (await db.scalars(stmt, [row for _, row in rows])).all()
+    user_id = rows[0][1]["user_id"]
+    percentages = [attempt_percentage(row["score"], row["total_questions"]) for _, row in rows]
+    await db.execute(record_stats(db, user_id, percentages=percentages))
+    await db.execute(record_daily_stats(
+        db, user_id, [(row["completed_at"], p) for (_, row), p in zip(rows, percentages)]
+    ))
+    await db.commit()
+    for quiz_id in {row["quiz_id"] for _, row in rows}:
+        analytics_cache.invalidate(quiz_id)
+    return list(attempt_ids)
+
+
+@router.post("/attempts/batch", response_model=AttemptBatchResponse)
+@limiter.limit("30/hour")
+async def submit_attempts_batch(
+    request: Request,
+    data: AttemptBatchSubmit,
+    db: AsyncSession = Depends(get_async_write_db),
+    current_user: User = Depends(get_current_active_user_async),
+):
+    quiz_ids = [item.quiz_id for item in data.attempts]
+    keys = await get_answer_keys(db, quiz_ids)
+    errors, rows = _score_batch(data.attempts, keys, current_user.id)
+    try:
+        attempt_ids = await _insert_attempts(db, rows)
+    except IntegrityError:
+        # A cached key outlived its quiz; reload from the database and rescore once
+        await db.rollback()
+        for quiz_id in keys:
+            answer_keys.invalidate(quiz_id)
+        keys = await get_answer_keys(db, quiz_ids)
+        errors, rows = _score_batch(data.attempts, keys, current_user.id)
+        attempt_ids = await _insert_attempts(db, rows)
+
+    results = [AttemptBatchResult(index=index, error=error) for index, error in errors]
+    for (index, row), attempt_id in zip(rows, attempt_ids):
+        results.append(AttemptBatchResult(
+            index=index,
+            attempt=AttemptResponse(
+                id=attempt_id,
+                quiz_id=row["quiz_id"],
+                quiz_title=keys[row["quiz_id"]].title,
+                score=row["score"],
+                total_questions=row["total_questions"],
+                percentage=round(row["score"] / row["total_questions"] * 100, 1) if row["total_questions"] > 0 else 0,
+                completed_at=row["completed_at"],
+            ),
+        ))
+    return AttemptBatchResponse(results=sorted(results, key=lambda r: r.index))
@@ -12,6 +12,7 @@ from app.config import settings
 from app.database import get_db
 from app.limiter import limiter
 from app.models.user import User
+from app.responses import FastRoute
 from app.schemas.settings import (
     ChangeEmailRequest,
     ProfileResponse,
@@ -22,7 +23,7 @@ from app.schemas.settings import (
 
 logger = logging.getLogger("qwizme.settings")
 
-router = APIRouter(prefix="/settings", tags=["settings"])
+router = APIRouter(prefix="/settings", tags=["settings"], route_class=FastRoute)
 
 UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
 USERNAME_RE = re.compile(r"^[a-zA-Z0-9_]+$")
@@ -60,6 +61,7 @@ def get_settings(current_user: User = Depends(get_current_active_user)):
     return UserSettingsResponse(
         ai_provider=current_user.ai_provider,
         has_api_key=bool(current_user.ai_api_key_encrypted),
+        ai_cache_opt_out=current_user.ai_cache_opt_out,
         is_verified=current_user.is_verified,
     )
 
@@ -84,12 +86,16 @@ def update_settings(
         else:
             current_user.ai_api_key_encrypted = None
 
+    if data.ai_cache_opt_out is not None:
+        current_user.ai_cache_opt_out = data.ai_cache_opt_out
+
     db.commit()
     db.refresh(current_user)
 
     return UserSettingsResponse(
         ai_provider=current_user.ai_provider,
         has_api_key=bool(current_user.ai_api_key_encrypted),
+        ai_cache_opt_out=current_user.ai_cache_opt_out,
         is_verified=current_user.is_verified,
     )
 
@@ -1,55 +1,50 @@
-from fastapi import APIRouter, Depends, Request
-from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload
+from datetime import datetime, timedelta, timezone
 
-from app.auth.dependencies import get_current_active_user
-from app.database import get_db
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.auth.dependencies import get_current_active_user_async
+from app.database import get_async_read_db
 from app.limiter import limiter
-from app.models.quiz import Quiz
+from app.models.daily_stats import UserDailyStats
 from app.models.quiz_attempt import QuizAttempt
 from app.models.user import User
-from app.schemas.attempt import AttemptResponse, StatsResponse
+from app.models.user_stats import UserStats
+from app.responses import FastRoute
+from app.schemas.attempt import AttemptResponse, DailyProgress, StatsResponse, StatsTimeseriesResponse
+
+router = APIRouter(prefix="/stats", tags=["stats"], route_class=FastRoute)
 
-router = APIRouter(prefix="/stats", tags=["stats"])
+MAX_TIMESERIES_DAYS = 365
 
 
 @router.get("", response_model=StatsResponse)
 @limiter.limit("30/minute")
-def get_stats(
+async def get_stats(
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async),
 ):
-    total_quizzes = db.query(func.count(Quiz.id)).filter(Quiz.user_id == current_user.id).scalar() or 0
-
-    attempts = (
-        db.query(QuizAttempt)
-        .filter(QuizAttempt.user_id == current_user.id)
-        .order_by(QuizAttempt.completed_at.desc())
-        .all()
-    )
-
-    total_taken = len(attempts)
-
+    stats = await db.get(UserStats, current_user.id)
+    total_taken = stats.attempts if stats else 0
     if total_taken > 0:
-        percentages = [
-            (a.score / a.total_questions * 100) if a.total_questions > 0 else 0
-            for a in attempts
-        ]
-        avg_score = round(sum(percentages) / len(percentages), 1)
-        best_score = round(max(percentages), 1)
+        avg_score = round(stats.percentage_sum / total_taken, 1)
+        best_score = round(stats.best_percentage, 1)
     else:
         avg_score = 0.0
         best_score = 0.0
 
     recent = (
-        db.query(QuizAttempt)
-        .options(joinedload(QuizAttempt.quiz))
-        .filter(QuizAttempt.user_id == current_user.id)
-        .order_by(QuizAttempt.completed_at.desc())
-        .limit(10)
-        .all()
-    )
+        await db.scalars(
+            select(QuizAttempt)
+            .options(joinedload(QuizAttempt.quiz))
+            .where(QuizAttempt.user_id == current_user.id)
+            .order_by(QuizAttempt.completed_at.desc())
+            .limit(10)
+        )
+    ).all()
     recent_responses = []
     for a in recent:
         recent_responses.append(
@@ -65,9 +60,39 @@ def get_stats(
         )
 
     return StatsResponse(
-        total_quizzes_created=total_quizzes,
+        total_quizzes_created=stats.quizzes_created if stats else 0,
         total_quizzes_taken=total_taken,
         average_score=avg_score,
         best_score=best_score,
         recent_attempts=recent_responses,
     )
+
+
+@router.get("/timeseries", response_model=StatsTimeseriesResponse)
+@limiter.limit("30/minute")
+async def get_stats_timeseries(
+    request: Request,
+    range_: str = Query("90d", alias="range", pattern=r"^\d{1,3}d$", description="Days back from today, e.g. 30d"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async),
+):
+    """Daily attempt counts and average scores, read from the per-day rollups."""
+    days = min(max(int(range_[:-1]), 1), MAX_TIMESERIES_DAYS)
+    today = datetime.now(timezone.utc).date()
+    start = today - timedelta(days=days - 1)
+    buckets = {
+        row.day: row
+        for row in await db.scalars(
+            select(UserDailyStats).where(UserDailyStats.user_id == current_user.id, UserDailyStats.day >= start)
+        )
+    }
+    series = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        bucket = buckets.get(day)
+        series.append(DailyProgress(
+            day=day,
+            attempts=bucket.attempts if bucket else 0,
+            average_score=round(bucket.percentage_sum / bucket.attempts, 1) if bucket and bucket.attempts else None,
+        ))
+    return StatsTimeseriesResponse(days=series)
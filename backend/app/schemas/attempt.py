@@ -1,10 +1,26 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, NonNegativeInt, model_validator
 
 
 class AttemptSubmit(BaseModel):
     answers: list[int] = Field(min_length=1, max_length=500)
+    response_times_ms: list[NonNegativeInt] | None = None  # per question, aligned with answers
+
+    @model_validator(mode="after")
+    def _times_match_answers(self):
+        if self.response_times_ms is not None and len(self.response_times_ms) != len(self.answers):
+            raise ValueError("response_times_ms must have one entry per answer")
+        return self
+
+
+class AttemptBatchItem(AttemptSubmit):
+    quiz_id: int
+    completed_at: datetime | None = None  # when the quiz was taken offline; defaults to now
+
+
+class AttemptBatchSubmit(BaseModel):
+    attempts: list[AttemptBatchItem] = Field(min_length=1, max_length=100)
 
 
 class AttemptResponse(BaseModel):
@@ -17,9 +33,55 @@ class AttemptResponse(BaseModel):
     completed_at: datetime
 
 
+class AttemptBatchResult(BaseModel):
+    index: int
+    attempt: AttemptResponse | None = None
+    error: str | None = None
+
+
+class AttemptBatchResponse(BaseModel):
+    results: list[AttemptBatchResult]
+
+
 class StatsResponse(BaseModel):
     total_quizzes_created: int
     total_quizzes_taken: int
     average_score: float
     best_score: float
     recent_attempts: list[AttemptResponse]
+
+
+class DailyProgress(BaseModel):
+    day: date
+    attempts: int
+    average_score: float | None  # None on days without attempts
+
+
+class StatsTimeseriesResponse(BaseModel):
+    days: list[DailyProgress]  # oldest first, one entry per UTC day in the range
+
+
+class QuestionAnalytics(BaseModel):
+    position: int  # 0-based, in question order
+    responses: int  # attempts that recorded their answers
+    correct: int
+    skipped: int
+    correct_rate: float  # percentage of responses
+    average_response_ms: float | None  # None when no attempt recorded timings
+
+
+class HistogramBin(BaseModel):
+    start: float  # percentage, inclusive
+    end: float  # percentage, exclusive except for the last bin
+    count: int
+
+
+class QuizAnalytics(BaseModel):
+    quiz_id: int
+    attempts: int
+    mean: float
+    median: float
+    p10: float
+    p90: float
+    histogram: list[HistogramBin]
+    questions: list[QuestionAnalytics]
@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel
+
+JobStatus = Literal["queued", "storing", "generating", "succeeded", "failed"]
+
+
+class GenerationJobResponse(BaseModel):
+    id: int
+    status: JobStatus
+    quiz_id: int | None  # set once the job succeeds
+    error: str | None  # set when the job fails
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -10,6 +11,29 @@ class QuizCreate(BaseModel):
     questions: list[QuestionCreate] = Field(min_length=1, max_length=50)
 
 
+class QuestionImport(QuestionCreate):
+    correct_answer_index: int | None = None  # derived from the answers when omitted
+
+
+class QuizImport(BaseModel):
+    """One line of a quiz library export."""
+
+    title: str = Field(min_length=1, max_length=255)
+    source_type: Literal["manual", "ai_generated"] = "manual"
+    created_at: datetime | None = None
+    questions: list[QuestionImport] = Field(min_length=1, max_length=500)
+
+
+class QuizImportError(BaseModel):
+    line: int
+    error: str
+
+
+class QuizImportResponse(BaseModel):
+    imported: int
+    errors: list[QuizImportError]
+
+
 class QuizResponse(BaseModel):
     id: int
     title: str
@@ -20,6 +44,19 @@ class QuizResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class SimilarQuiz(BaseModel):
+    """A quiz generated from a near-duplicate image, offered before generating."""
+
+    content_hash: str  # pass back as ``reuse`` to accept it
+    title: str
+    question_count: int
+    distance: int  # differing perceptual-hash bits, of 64
+
+
+class SimilarQuizResponse(BaseModel):
+    match: SimilarQuiz | None
+
+
 class QuizDetail(BaseModel):
     id: int
     title: str
@@ -33,5 +70,6 @@ class QuizDetail(BaseModel):
 
 class QuizListResponse(BaseModel):
     quizzes: list[QuizResponse]
-    total: int
+    total: int | None  # None when requested with include_total=false
     has_more: bool
+    next_cursor: str | None = None
@@ -7,6 +7,7 @@ from pydantic import BaseModel, EmailStr, Field
 class UserSettingsResponse(BaseModel):
     ai_provider: str | None
     has_api_key: bool
+    ai_cache_opt_out: bool
     is_verified: bool
 
     model_config = {"from_attributes": True}
@@ -15,6 +16,7 @@ class UserSettingsResponse(BaseModel):
 class UserSettingsUpdate(BaseModel):
     ai_provider: Literal["claude", "openai"] | None = None
     ai_api_key: str | None = Field(None, max_length=1000)
+    ai_cache_opt_out: bool | None = None
 
 
 class ProfileResponse(BaseModel):
@@ -1,7 +1,12 @@
+import asyncio
 import base64
 import json
 import logging
 import re
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+from app.config import settings
 
 logger = logging.getLogger("qwizme.ai")
 
@@ -42,22 +47,104 @@ def _parse_quiz_json(text: str) -> dict:
     return data
 
 
-def generate_quiz_claude(image_bytes: bytes, media_type: str, api_key: str) -> dict:
+class _PooledClient:
+    __slots__ = ("client", "loop", "in_use", "evicted")
+
+    def __init__(self, client, loop: asyncio.AbstractEventLoop):
+        self.client = client
+        self.loop = loop
+        self.in_use = 0
+        self.evicted = False
+
+
+class ClientPool:
+    """Async SDK clients reused per (provider, API key) within a worker.
+
+    Each client owns an HTTP connection pool, so reusing it keeps
+    connections to the provider alive between generations. A client's
+    connections belong to the event loop that opened them, so one found
+    under a different loop is replaced. Evicted clients are closed once
+    their last in-flight request finishes.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._clients: OrderedDict[tuple[str, str], _PooledClient] = OrderedDict()
+
+    @asynccontextmanager
+    async def use(self, provider: str, api_key: str):
+        entry = await self._checkout(provider, api_key)
+        entry.in_use += 1
+        try:
+            yield entry.client
+        finally:
+            entry.in_use -= 1
+            if entry.evicted and not entry.in_use:
+                await entry.client.close()
+
+    async def _checkout(self, provider: str, api_key: str) -> _PooledClient:
+        key = (provider, api_key)
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(key)
+        if entry is not None and entry.loop is loop:
+            self._clients.move_to_end(key)
+            return entry
+        entry = self._clients[key] = _PooledClient(_new_client(provider, api_key), loop)
+        self._clients.move_to_end(key)
+        while len(self._clients) > self.maxsize:
+            _, evicted = self._clients.popitem(last=False)
+            evicted.evicted = True
+            # Busy clients are closed by the last request using them
+            if evicted.loop is loop and not evicted.in_use:
+                await evicted.client.close()
+        return entry
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        entries = list(self._clients.values())
+        self._clients.clear()
+        for entry in entries:
+            if entry.loop is loop:
+                await entry.client.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+def _new_client(provider: str, api_key: str):
+    # SDKs are imported on first use to keep them out of the API's cold start
+    if provider == "claude":
+        import anthropic
+        return anthropic.AsyncAnthropic(
+            api_key=api_key, base_url=settings.ANTHROPIC_BASE_URL or None, timeout=settings.AI_TIMEOUT_SECONDS
+        )
+    if provider == "openai":
+        import openai
+        return openai.AsyncOpenAI(
+            api_key=api_key, base_url=settings.OPENAI_BASE_URL or None, timeout=settings.AI_TIMEOUT_SECONDS
+        )
+    raise ValueError(f"Unsupported AI provider: {provider}")
+
+
+clients = ClientPool(settings.AI_CLIENT_POOL_SIZE)
+
+
+async def generate_quiz_claude(image_bytes: bytes, media_type: str, api_key: str) -> dict:
     import anthropic
-    client = anthropic.Anthropic(api_key=api_key)
     b64 = base64.standard_b64encode(image_bytes).decode()
     try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
-            messages=[{
-                "role": "user",
-                "content": [
-                    {"type": "image", "source": {"type": "base64", "media_type": media_type, "data": b64}},
-                    {"type": "text", "text": QUIZ_PROMPT},
-                ],
-            }],
-        )
+        async with clients.use("claude", api_key) as client:
+            message = await client.messages.create(
+                model="claude-sonnet-4-20250514",
+                max_tokens=4096,
+                messages=[{
+                    "role": "user",
+                    "content": [
+                        {"type": "image", "source": {"type": "base64", "media_type": media_type, "data": b64}},
+                        {"type": "text", "text": QUIZ_PROMPT},
+                    ],
+                }],
+            )
     except anthropic.AuthenticationError:
         raise ValueError("Invalid API key")
     except anthropic.APIError as e:
@@ -66,22 +153,22 @@ def generate_quiz_claude(image_bytes: bytes, media_type: str, api_key: str) -> d
     return _parse_quiz_json(message.content[0].text)
 
 
-def generate_quiz_openai(image_bytes: bytes, media_type: str, api_key: str) -> dict:
+async def generate_quiz_openai(image_bytes: bytes, media_type: str, api_key: str) -> dict:
     import openai
-    client = openai.OpenAI(api_key=api_key)
     b64 = base64.standard_b64encode(image_bytes).decode()
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            max_tokens=4096,
-            messages=[{
-                "role": "user",
-                "content": [
-                    {"type": "image_url", "image_url": {"url": f"data:{media_type};base64,{b64}"}},
-                    {"type": "text", "text": QUIZ_PROMPT},
-                ],
-            }],
-        )
+        async with clients.use("openai", api_key) as client:
+            response = await client.chat.completions.create(
+                model="gpt-4o",
+                max_tokens=4096,
+                messages=[{
+                    "role": "user",
+                    "content": [
+                        {"type": "image_url", "image_url": {"url": f"data:{media_type};base64,{b64}"}},
+                        {"type": "text", "text": QUIZ_PROMPT},
+                    ],
+                }],
+            )
     except openai.AuthenticationError:
         raise ValueError("Invalid API key")
     except openai.APIError as e:
@@ -90,10 +177,10 @@ def generate_quiz_openai(image_bytes: bytes, media_type: str, api_key: str) -> d
     return _parse_quiz_json(response.choices[0].message.content)
 
 
-def generate_quiz(image_bytes: bytes, media_type: str, provider: str, api_key: str) -> dict:
+async def generate_quiz(image_bytes: bytes, media_type: str, provider: str, api_key: str) -> dict:
     if provider == "claude":
-        return generate_quiz_claude(image_bytes, media_type, api_key)
+        return await generate_quiz_claude(image_bytes, media_type, api_key)
     elif provider == "openai":
-        return generate_quiz_openai(image_bytes, media_type, api_key)
+        return await generate_quiz_openai(image_bytes, media_type, api_key)
     else:
         raise ValueError(f"Unsupported AI provider: {provider}")
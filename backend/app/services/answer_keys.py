@@ -0,0 +1,121 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.answer import Answer
+from app.models.question import Question
+from app.models.quiz import Quiz
+
+
+@dataclass(frozen=True, slots=True)
+class AnswerKey:
+    """Everything needed to score a quiz without loading its questions.
+
+    ``correct`` holds one bitmask per question (ordered by question id) with
+    bit ``i`` set when the answer at position ``i`` (ordered by answer id)
+    is correct.
+    """
+
+    user_id: int
+    title: str
+    correct: tuple[int, ...]
+
+    def score(self, selected: list[int]) -> int:
+        return sum(mask >> s & 1 for mask, s in zip(self.correct, selected) if s >= 0)
+
+
+class AnswerKeyCache:
+    """Bounded per-process LRU of answer keys by quiz id.
+
+    Quizzes cannot be edited, so deleting one is the only invalidation.
+    Other workers keep a deleted quiz's key until it ages out; submissions
+    against it then fail the attempt's foreign key and are turned into 404s.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._keys: OrderedDict[int, AnswerKey] = OrderedDict()
+
+    def get(self, quiz_id: int) -> AnswerKey | None:
+        with self._lock:
+            key = self._keys.get(quiz_id)
+            if key is not None:
+                self._keys.move_to_end(quiz_id)
+            return key
+
+    def put(self, quiz_id: int, key: AnswerKey) -> None:
+        with self._lock:
+            self._keys[quiz_id] = key
+            self._keys.move_to_end(quiz_id)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+
+    def invalidate(self, quiz_id: int) -> None:
+        with self._lock:
+            self._keys.pop(quiz_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+
+
+answer_keys = AnswerKeyCache(settings.ANSWER_KEY_CACHE_SIZE)
+
+
+async def load_answer_keys(db: AsyncSession, quiz_ids: list[int]) -> dict[int, AnswerKey]:
+    rows = (
+        await db.execute(
+            select(Quiz.id, Quiz.user_id, Quiz.title, Question.id, Answer.is_correct)
+            .outerjoin(Question, Question.quiz_id == Quiz.id)
+            .outerjoin(Answer, Answer.question_id == Question.id)
+            .where(Quiz.id.in_(quiz_ids))
+            .order_by(Quiz.id, Question.id, Answer.id)
+        )
+    ).all()
+
+    quizzes: dict[int, tuple[int, str]] = {}
+    masks: dict[int, dict[int, int]] = {}
+    positions: dict[int, int] = {}
+    for quiz_id, user_id, title, question_id, is_correct in rows:
+        quizzes[quiz_id] = (user_id, title)
+        quiz_masks = masks.setdefault(quiz_id, {})
+        if question_id is None:
+            continue
+        mask = quiz_masks.setdefault(question_id, 0)
+        if is_correct is None:
+            continue
+        position = positions.get(question_id, 0)
+        if is_correct:
+            quiz_masks[question_id] = mask | 1 << position
+        positions[question_id] = position + 1
+    return {
+        quiz_id: AnswerKey(user_id=user_id, title=title, correct=tuple(masks[quiz_id].values()))
+        for quiz_id, (user_id, title) in quizzes.items()
+    }
+
+
+async def get_answer_keys(db: AsyncSession, quiz_ids: list[int]) -> dict[int, AnswerKey]:
+    """Answer keys for the quizzes that exist, loading every cache miss in one query."""
+    keys = {}
+    missing = []
+    for quiz_id in dict.fromkeys(quiz_ids):
+        key = answer_keys.get(quiz_id)
+        if key is None:
+            missing.append(quiz_id)
+        else:
+            keys[quiz_id] = key
+    if missing:
+        loaded = await load_answer_keys(db, missing)
+        for quiz_id, key in loaded.items():
+            answer_keys.put(quiz_id, key)
+        keys.update(loaded)
+    return keys
+
+
+async def get_answer_key(db: AsyncSession, quiz_id: int) -> AnswerKey | None:
+    return (await get_answer_keys(db, [quiz_id])).get(quiz_id)
@@ -0,0 +1,23 @@
+"""Packed per-question responses stored on ``quiz_attempts``.
+
+``responses`` holds one byte per question: the selected answer position, or
+``NO_ANSWER`` for a skipped (negative) or out-of-range selection.
+``response_times`` holds one little-endian uint32 of milliseconds per
+question. Either way an attempt stays a single row however long the quiz.
+"""
+
+import struct
+
+NO_ANSWER = 255
+MAX_RESPONSE_MS = 2**32 - 1
+
+
+def pack_responses(selected: list[int]) -> bytes:
+    return bytes(s if 0 <= s < NO_ANSWER else NO_ANSWER for s in selected)
+
+
+def pack_response_times(times_ms: list[int] | None) -> bytes | None:
+    if times_ms is None:
+        return None
+    return struct.pack(f"<{len(times_ms)}I", *(min(t, MAX_RESPONSE_MS) for t in times_ms))
+
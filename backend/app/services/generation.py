@@ -0,0 +1,233 @@
+"""Image-to-quiz pipeline, shared by the synchronous endpoint and background jobs.
+
+``start_generation`` reads the user's settings and looks the upload up in
+the shared cache (app.services.generation_cache); ``run_generation`` stores
+the image and calls the model on a miss; ``save_generated_quiz`` adds the
+quiz. ``find_near_duplicate`` finds a cached quiz from a similar image for
+the client to offer before generating. No step holds a database transaction open across storage or model
+calls, so SQLite's write lock is only taken to save the finished quiz.
+"""
+
+import logging
+import os
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.models.generated_quiz import GeneratedQuizCache
+from app.models.quiz import Quiz
+from app.models.user import User
+from app.services import generation_cache
+from app.services.image_index import hamming, to_unsigned
+from app.services.quiz_store import add_quiz
+
+logger = logging.getLogger("qwizme.ai")
+
+UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
+ALLOWED_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
+ALLOWED_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
+
+
+class GenerationError(Exception):
+    """A pipeline failure with the message and HTTP status to report for it."""
+
+    def __init__(self, detail: str, status_code: int):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+def _image_ext(original: str | None) -> str:
+    ext = os.path.splitext(original or "image.png")[1].lower()
+    return ext if ext in ALLOWED_EXTS else ".png"
+
+
+def new_image_filename(original: str | None) -> str:
+    return f"{uuid.uuid4().hex}{_image_ext(original)}"
+
+
+def content_filename(digest: str, original: str | None) -> str:
+    return f"{digest}{_image_ext(original)}"
+
+
+def _save_local(filename: str, contents: bytes) -> None:
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(UPLOAD_DIR, filename)
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            f.write(contents)
+
+
+async def store_image(filename: str, contents: bytes, media_type: str) -> str:
+    """Store the upload (Supabase in production, local in dev) and return its reference.
+
+    A content-addressed name may already be stored; writing it again is harmless.
+    """
+    if settings.SUPABASE_URL and settings.SUPABASE_SERVICE_KEY:
+        try:
+            from app.services.storage import upload_to_supabase
+            return await run_in_threadpool(upload_to_supabase, filename, contents, media_type, upsert=True)
+        except Exception as e:
+            logger.error("Supabase upload failed: %s", e)
+            raise GenerationError("Failed to store image", 500)
+    await run_in_threadpool(_save_local, filename, contents)
+    return filename
+
+
+async def user_ai_settings(db: AsyncSession, user_id: int) -> tuple[str | None, str | None, bool]:
+    """The user's AI provider, encrypted API key (a deferred column) and cache opt-out."""
+    row = (await db.execute(
+        select(User.ai_provider, User.ai_api_key_encrypted, User.ai_cache_opt_out).where(User.id == user_id)
+    )).first()
+    return (row.ai_provider, row.ai_api_key_encrypted, row.ai_cache_opt_out) if row else (None, None, False)
+
+
+@dataclass(slots=True)
+class Generation:
+    """One upload on its way to a quiz."""
+
+    provider: str | None
+    encrypted_key: str | None
+    content_hash: str | None  # the upload's content address; None when the user opted out
+    quiz_data: dict | None = None
+    image_ref: str | None = None
+    phash: int | None = None
+    cache_key: str | None = None  # the cache entry the quiz was reused from
+
+    @property
+    def cacheable(self) -> bool:
+        # Mock quizzes are free; only model output is worth sharing
+        return bool(self.content_hash and self.provider and self.encrypted_key and generation_cache.enabled())
+
+
+async def _new_generation(db: AsyncSession, user_id: int, contents: bytes) -> Generation:
+    provider, encrypted_key, opt_out = await user_ai_settings(db, user_id)
+    return Generation(provider, encrypted_key, None if opt_out else generation_cache.content_hash(contents))
+
+
+async def _perceptual_hash(contents: bytes) -> int | None:
+    if settings.NEAR_DUPLICATE_DISTANCE <= 0:
+        return None
+    from app.services.image_prep import perceptual_hash
+    try:
+        return await perceptual_hash(contents)
+    except ImportError as e:
+        # Without Pillow, near-duplicate lookup finds nothing rather than failing
+        logger.warning("Perceptual hashing unavailable: %s", e)
+        return None
+
+
+async def find_near_duplicate(
+    db: AsyncSession, user_id: int, contents: bytes
+) -> tuple[int, GeneratedQuizCache] | None:
+    """``(distance, entry)`` for a cached quiz from an image like ``contents``, to offer the user.
+
+    None when there is nothing to offer, including an exact match, which
+    ``start_generation`` reuses without asking.
+    """
+    generation = await _new_generation(db, user_id, contents)
+    if not generation.cacheable or await generation_cache.lookup(db, generation.content_hash) is not None:
+        return None
+    phash = await _perceptual_hash(contents)
+    if phash is None:
+        return None
+    return await generation_cache.find_similar(db, phash)
+
+
+async def start_generation(
+    db: AsyncSession, user_id: int, contents: bytes, reuse: str | None = None
+) -> Generation:
+    """Read the user's AI settings and look for a cached quiz for ``contents``.
+
+    An exact match is reused outright, stored image included. ``reuse`` is
+    the content hash of a near-duplicate the user accepted from
+    ``find_near_duplicate``: its quiz is reused if the upload is still
+    within ``NEAR_DUPLICATE_DISTANCE`` bits of it, but the upload is stored
+    as the quiz's own image. Commit or close ``db`` before ``run_generation``.
+    """
+    generation = await _new_generation(db, user_id, contents)
+    if not generation.cacheable:
+        return generation
+    entry = await generation_cache.lookup(db, generation.content_hash)
+    if entry is not None:
+        generation.quiz_data, generation.image_ref = entry.quiz_data, entry.image_ref
+        generation.cache_key = entry.content_hash
+        return generation
+    generation.phash = await _perceptual_hash(contents)
+    if reuse and generation.phash is not None:
+        entry = await generation_cache.lookup(db, reuse)
+        if (
+            entry is not None
+            and entry.phash is not None
+            and hamming(generation.phash, to_unsigned(entry.phash)) <= settings.NEAR_DUPLICATE_DISTANCE
+        ):
+            generation.quiz_data, generation.cache_key = entry.quiz_data, entry.content_hash
+    return generation
+
+
+async def run_generation(
+    generation: Generation,
+    contents: bytes,
+    media_type: str,
+    original_filename: str | None,
+    on_stored: Callable[[], Awaitable[None]] | None = None,
+) -> None:
+    """Store the image and generate its quiz, skipping whatever the cache already provided."""
+    if generation.content_hash:
+        filename = content_filename(generation.content_hash, original_filename)
+    else:
+        filename = new_image_filename(original_filename)
+    if generation.image_ref is None:
+        generation.image_ref = await store_image(filename, contents, media_type)
+        if on_stored is not None:
+            await on_stored()
+    if generation.quiz_data is None:
+        generation.quiz_data = await generate_quiz_data(
+            contents, media_type, filename, generation.provider, generation.encrypted_key
+        )
+
+
+async def generate_quiz_data(
+    contents: bytes, media_type: str, filename: str, provider: str | None, encrypted_key: str | None
+) -> dict:
+    """Real AI if the user has a key configured, else a mock quiz."""
+    if provider and encrypted_key:
+        try:
+            from app.services.encryption import decrypt_value
+            from app.services.ai_service import generate_quiz
+            from app.services.image_prep import prepare_for_provider
+            api_key = decrypt_value(encrypted_key)
+            image, image_type = await prepare_for_provider(contents, media_type, provider)
+            return await generate_quiz(image, image_type, provider, api_key)
+        except ValueError:
+            raise GenerationError("AI configuration error — check your API key in Settings", 400)
+        except Exception as e:
+            logger.error("AI generation failed: %s", e)
+            raise GenerationError("AI service error — check your API key and try again", 502)
+    # The topic banks are large; only load them when a mock quiz is needed
+    from app.services.mock_ai import generate_quiz_from_image
+    return generate_quiz_from_image(filename)
+
+
+async def save_generated_quiz(db: AsyncSession, user_id: int, generation: Generation) -> Quiz:
+    """Add the quiz to ``db`` and record it in the shared cache; the caller commits."""
+    quiz = await db.run_sync(
+        add_quiz,
+        user_id,
+        generation.quiz_data["title"],
+        "ai_generated",
+        generation.quiz_data["questions"],
+        image_filename=generation.image_ref,
+    )
+    if generation.cache_key:
+        await generation_cache.record_hit(db, generation.cache_key)
+    elif generation.cacheable:
+        await generation_cache.remember(
+            db, generation.content_hash, generation.quiz_data, generation.image_ref, generation.phash
+        )
+    return quiz
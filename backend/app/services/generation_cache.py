@@ -0,0 +1,130 @@
+"""Reuse generated quizzes for identical uploads.
+
+When several students upload the same worksheet, only the first upload
+should pay for storage and a model call. Uploads are addressed by the
+SHA-256 of their bytes: the image is stored under that name, and the
+quiz the model produced for it is kept in ``generated_quiz_cache``,
+which every worker shares through the database.
+
+Entries expire ``GENERATED_QUIZ_CACHE_TTL`` seconds after their last use,
+and past ``GENERATED_QUIZ_CACHE_SIZE`` entries the least recently used
+are evicted whenever a new one is added. Only model output is cached
+(mock quizzes cost nothing). Users with ``ai_cache_opt_out`` neither read
+nor add entries, and their uploads keep random names.
+
+Entries also carry a perceptual hash of their image, so another photo of
+the same page (recompressed, rescaled, slightly rotated) within
+``NEAR_DUPLICATE_DISTANCE`` bits can be offered the quiz; ``find_similar``
+searches the in-process index in app.services.image_index. Near matches
+can be wrong, so they are only reused once the user accepts the offer.
+"""
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.generated_quiz import GeneratedQuizCache
+from app.services.image_index import near_duplicates, to_signed, to_unsigned
+
+_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def content_hash(contents: bytes) -> str:
+    return hashlib.sha256(contents).hexdigest()
+
+
+def enabled() -> bool:
+    return settings.GENERATED_QUIZ_CACHE_SIZE > 0
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _cutoff() -> datetime:
+    return _now() - timedelta(seconds=settings.GENERATED_QUIZ_CACHE_TTL)
+
+
+async def lookup(db: AsyncSession, digest: str) -> GeneratedQuizCache | None:
+    return await db.scalar(
+        select(GeneratedQuizCache).where(
+            GeneratedQuizCache.content_hash == digest, GeneratedQuizCache.last_used_at >= _cutoff()
+        )
+    )
+
+
+async def load_index(db: AsyncSession) -> None:
+    """Fill this worker's near-duplicate index from the database, once."""
+    if near_duplicates.loaded:
+        return
+    rows = await db.execute(
+        select(GeneratedQuizCache.content_hash, GeneratedQuizCache.phash).where(
+            GeneratedQuizCache.phash.is_not(None), GeneratedQuizCache.last_used_at >= _cutoff()
+        )
+    )
+    for digest, phash in rows:
+        near_duplicates.add(digest, to_unsigned(phash))
+    near_duplicates.loaded = True
+
+
+async def find_similar(db: AsyncSession, phash: int) -> tuple[int, GeneratedQuizCache] | None:
+    """``(distance, entry)`` for the live entry nearest to ``phash``, within ``NEAR_DUPLICATE_DISTANCE`` bits."""
+    await load_index(db)
+    for distance, digest in near_duplicates.search(phash, settings.NEAR_DUPLICATE_DISTANCE):
+        entry = await lookup(db, digest)
+        if entry is not None:
+            return distance, entry
+        # Expired, or evicted by another worker
+        near_duplicates.remove(digest)
+    return None
+
+
+async def record_hit(db: AsyncSession, digest: str) -> None:
+    await db.execute(
+        update(GeneratedQuizCache)
+        .where(GeneratedQuizCache.content_hash == digest)
+        .values(hits=GeneratedQuizCache.hits + 1, last_used_at=_now())
+    )
+
+
+async def remember(
+    db: AsyncSession, digest: str, quiz_data: dict, image_ref: str, phash: int | None = None
+) -> None:
+    """Add the quiz generated for ``digest`` and evict stale entries; the caller commits."""
+    insert = _INSERTS[db.get_bind().dialect.name]
+    now = _now()
+    stored_phash = None if phash is None else to_signed(phash)
+    # Replaces an expired entry, or one added by a concurrent upload of the same image
+    await db.execute(
+        insert(GeneratedQuizCache)
+        .values(
+            content_hash=digest,
+            quiz_data=quiz_data,
+            image_ref=image_ref,
+            phash=stored_phash,
+            created_at=now,
+            last_used_at=now,
+        )
+        .on_conflict_do_update(
+            index_elements=[GeneratedQuizCache.content_hash],
+            set_={"quiz_data": quiz_data, "image_ref": image_ref, "phash": stored_phash, "last_used_at": now},
+        )
+    )
+    overflow = (
+        select(GeneratedQuizCache.content_hash)
+        .order_by(GeneratedQuizCache.last_used_at.desc())
+        .offset(settings.GENERATED_QUIZ_CACHE_SIZE)
+    )
+    evicted = await db.scalars(
+        delete(GeneratedQuizCache)
+        .where(or_(GeneratedQuizCache.last_used_at < _cutoff(), GeneratedQuizCache.content_hash.in_(overflow)))
+        .returning(GeneratedQuizCache.content_hash)
+    )
+    for key in evicted:
+        near_duplicates.remove(key)
+    if phash is not None:
+        near_duplicates.add(digest, phash)
@@ -0,0 +1,213 @@
+"""Background image-to-quiz generation.
+
+Jobs live in ``generation_jobs`` with the uploaded image, so a restart
+loses nothing: a worker claims the oldest queued job (or one whose lease
+ran out because its worker died), runs the pipeline in
+``app.services.generation`` and records the quiz or the error.
+
+Each web worker runs ``GENERATION_WORKERS`` claiming coroutines; with 0,
+run them elsewhere with ``python -m app.manage run-jobs``.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncWriteSessionLocal
+from app.models.generation_job import GenerationJob
+from app.services.generation import GenerationError, run_generation, save_generated_quiz, start_generation
+
+logger = logging.getLogger("qwizme.jobs")
+
+ACTIVE = ("storing", "generating")
+TERMINAL = ("succeeded", "failed")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _lease() -> datetime:
+    return _now() + timedelta(seconds=settings.GENERATION_JOB_LEASE_SECONDS)
+
+
+async def enqueue_job(
+    db: AsyncSession, user_id: int, filename: str, media_type: str, contents: bytes
+) -> GenerationJob:
+    job = GenerationJob(user_id=user_id, image_filename=filename, media_type=media_type, image_data=contents)
+    db.add(job)
+    await db.commit()
+    return job
+
+
+async def claim_job(factory) -> tuple[int, int] | None:
+    """Mark the next claimable job as started; returns ``(job_id, attempts)``."""
+    now = _now()
+    claimable = or_(
+        GenerationJob.status == "queued",
+        and_(GenerationJob.status.in_(ACTIVE), GenerationJob.lease_expires_at < now),
+    )
+    # SKIP LOCKED keeps Postgres workers off each other's rows; SQLite serializes writers anyway
+    candidate = (
+        select(GenerationJob.id).where(claimable).order_by(GenerationJob.id).limit(1)
+        .with_for_update(skip_locked=True).scalar_subquery()
+    )
+    async with factory() as db:
+        row = (await db.execute(
+            update(GenerationJob)
+            .where(GenerationJob.id == candidate, claimable)
+            .values(
+                status="storing", attempts=GenerationJob.attempts + 1, lease_expires_at=_lease(), updated_at=now
+            )
+            .returning(GenerationJob.id, GenerationJob.attempts)
+        )).first()
+        await db.commit()
+    return tuple(row) if row else None
+
+
+def _fenced(job_id: int, attempts: int):
+    # A worker whose lease ran out finds attempts bumped by the next claim, so
+    # its late writes match nothing
+    return update(GenerationJob).where(GenerationJob.id == job_id, GenerationJob.attempts == attempts)
+
+
+async def _update(factory, job_id: int, attempts: int, **values) -> bool:
+    """Update the job if this claim still holds it; False once another worker took over."""
+    async with factory() as db:
+        result = await db.execute(_fenced(job_id, attempts).values(updated_at=_now(), **values))
+        await db.commit()
+    return result.rowcount == 1
+
+
+async def _fail(factory, job_id: int, attempts: int, error: str) -> None:
+    await _update(factory, job_id, attempts, status="failed", error=error, image_data=None, lease_expires_at=None)
+
+
+async def _renew_lease(factory, job_id: int, attempts: int) -> None:
+    """Keep the lease ahead of a slow generation (provider retries included) until cancelled."""
+    while True:
+        await asyncio.sleep(settings.GENERATION_JOB_LEASE_SECONDS / 3)
+        if not await _update(factory, job_id, attempts, lease_expires_at=_lease()):
+            return
+
+
+class _LeaseLost(Exception):
+    pass
+
+
+async def run_job(factory, job_id: int, attempts: int) -> None:
+    if attempts > settings.GENERATION_JOB_MAX_ATTEMPTS:
+        await _fail(factory, job_id, attempts, "Generation did not complete — please try again")
+        return
+
+    async with factory() as db:
+        job = (await db.execute(
+            select(
+                GenerationJob.user_id, GenerationJob.image_data, GenerationJob.image_filename,
+                GenerationJob.media_type,
+            ).where(GenerationJob.id == job_id)
+        )).first()
+        generation = await start_generation(db, job.user_id, job.image_data)
+        await db.commit()
+
+    async def generating() -> None:
+        if not await _update(factory, job_id, attempts, status="generating", lease_expires_at=_lease()):
+            raise _LeaseLost
+
+    heartbeat = asyncio.create_task(_renew_lease(factory, job_id, attempts))
+    try:
+        await run_generation(generation, job.image_data, job.media_type, job.image_filename, on_stored=generating)
+    except GenerationError as e:
+        await _fail(factory, job_id, attempts, e.detail)
+        return
+    except _LeaseLost:
+        logger.warning("Generation job %s was claimed by another worker; stopping", job_id)
+        return
+    finally:
+        heartbeat.cancel()
+
+    async with factory() as db:
+        quiz = await save_generated_quiz(db, job.user_id, generation)
+        result = await db.execute(
+            _fenced(job_id, attempts).values(
+                status="succeeded", quiz_id=quiz.id, image_data=None, lease_expires_at=None, updated_at=_now()
+            )
+        )
+        if result.rowcount != 1:
+            # The other worker saves its own quiz; keep the user from getting two
+            await db.rollback()
+            logger.warning("Generation job %s was claimed by another worker; discarding its quiz", job_id)
+            return
+        await db.commit()
+
+
+class JobRunner:
+    """A bounded pool of coroutines claiming and running jobs in this process."""
+
+    def __init__(self, factory, concurrency: int, poll_seconds: float):
+        self.factory = factory
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup: asyncio.Event | None = None
+
+    def start(self) -> None:
+        if self.concurrency <= 0 or self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+
+    def notify(self) -> None:
+        """Wake idle workers after an enqueue instead of waiting for the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def serve(self) -> None:
+        """Run the workers until cancelled, for a dedicated job process."""
+        self.start()
+        await asyncio.gather(*self._tasks)
+
+    async def run_next(self) -> bool:
+        claimed = await claim_job(self.factory)
+        if claimed is None:
+            return False
+        try:
+            await run_job(self.factory, *claimed)
+        except Exception:
+            # The lease runs out and another attempt picks the job up
+            logger.exception("Generation job %s crashed", claimed[0])
+        return True
+
+    async def drain(self) -> int:
+        """Run jobs until none are claimable; returns how many ran."""
+        ran = 0
+        while await self.run_next():
+            ran += 1
+        return ran
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                if await self.run_next():
+                    continue
+            except Exception:
+                logger.exception("Claiming a generation job failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+runner = JobRunner(AsyncWriteSessionLocal, settings.GENERATION_WORKERS, settings.GENERATION_JOB_POLL_SECONDS)
@@ -0,0 +1,100 @@
+"""In-process index of perceptual hashes, for near-duplicate uploads.
+
+A multi-index hash table: each 64-bit hash is split into four 16-bit
+chunks, each with its own table. Two hashes within Hamming distance ``d``
+agree to within ``d // 4`` bits on at least one chunk, so a search only
+probes those few chunk values (17 per chunk for ``d`` up to 7) and checks
+the candidates, instead of scanning every hash.
+
+Keys are ``generated_quiz_cache`` content hashes. Each worker loads the
+index from the database on first use and adds the entries it creates;
+searches may return keys that were since evicted, which callers drop.
+"""
+
+from collections import defaultdict
+from functools import cache
+from itertools import combinations
+
+CHUNKS = 4
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+HASH_BITS = CHUNKS * CHUNK_BITS
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def to_signed(value: int) -> int:
+    """Fit an unsigned 64-bit hash into a BIGINT column."""
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def to_unsigned(value: int) -> int:
+    return value & ((1 << HASH_BITS) - 1)
+
+
+@cache
+def _flips(radius: int) -> tuple[int, ...]:
+    """Every CHUNK_BITS-wide mask with at most ``radius`` bits set."""
+    masks = [0]
+    for count in range(1, radius + 1):
+        for bits in combinations(range(CHUNK_BITS), count):
+            masks.append(sum(1 << bit for bit in bits))
+    return tuple(masks)
+
+
+def _chunks(value: int):
+    for i in range(CHUNKS):
+        yield (value >> (i * CHUNK_BITS)) & CHUNK_MASK
+
+
+class HammingIndex:
+    def __init__(self):
+        self._tables: list[defaultdict[int, set[str]]] = [defaultdict(set) for _ in range(CHUNKS)]
+        self._hashes: dict[str, int] = {}
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def add(self, key: str, value: int) -> None:
+        self.remove(key)
+        self._hashes[key] = value
+        for table, chunk in zip(self._tables, _chunks(value)):
+            table[chunk].add(key)
+
+    def remove(self, key: str) -> None:
+        value = self._hashes.pop(key, None)
+        if value is None:
+            return
+        for table, chunk in zip(self._tables, _chunks(value)):
+            bucket = table[chunk]
+            bucket.discard(key)
+            if not bucket:
+                del table[chunk]
+
+    def search(self, value: int, max_distance: int) -> list[tuple[int, str]]:
+        """``(distance, key)`` for every hash within ``max_distance`` bits, nearest first."""
+        flips = _flips(max_distance // CHUNKS)
+        candidates: set[str] = set()
+        for table, chunk in zip(self._tables, _chunks(value)):
+            for mask in flips:
+                bucket = table.get(chunk ^ mask)
+                if bucket:
+                    candidates.update(bucket)
+        found = []
+        for key in candidates:
+            distance = hamming(value, self._hashes[key])
+            if distance <= max_distance:
+                found.append((distance, key))
+        return sorted(found)
+
+    def clear(self) -> None:
+        for table in self._tables:
+            table.clear()
+        self._hashes.clear()
+        self.loaded = False
+
+
+near_duplicates = HammingIndex()
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.answer import Answer
+from app.models.question import Question
+from app.models.quiz import Quiz
+from app.models.user import User
+from app.services.user_stats import record_stats
+
+
+def add_quiz(
+    db: Session,
+    user_id: int,
+    title: str,
+    source_type: str,
+    questions: list[dict],
+    image_filename: str | None = None,
+    created_at: datetime | None = None,
+) -> Quiz:
+    """Write a quiz with its questions and answers in seven statements.
+
+    ``questions`` use the AI generator's shape: ``question_text``,
+    ``explanation``, ``correct_answer_index`` and ``answers`` as
+    ``{"text", "is_correct"}`` dicts. Questions and answers go in as one
+    executemany each; question ids are read back in a single ordered SELECT,
+    since ids are handed out in insertion order and already double as the
+    display order. (SQLite cannot batch ordered INSERT ... RETURNING, so
+    relying on the unit of work would cost a round trip per row there.)
+    The last two statements bump the user's quiz list version and upsert
+    their stats row.
+    """
+    quiz = Quiz(user_id=user_id, title=title, source_type=source_type, image_filename=image_filename)
+    if created_at is not None:
+        quiz.created_at = created_at
+    db.add(quiz)
+    db.flush()
+
+    if questions:
+        db.execute(
+            insert(Question),
+            [
+                {
+                    "quiz_id": quiz.id,
+                    "question_text": q["question_text"],
+                    "explanation": q["explanation"],
+                    "correct_answer_index": q["correct_answer_index"],
+                }
+                for q in questions
+            ],
+        )
+        question_ids = db.scalars(
+            select(Question.id).where(Question.quiz_id == quiz.id).order_by(Question.id)
+        ).all()
+    else:
+        question_ids = []
+
+    answers = [
+        {"question_id": question_id, "answer_text": a["text"], "is_correct": a["is_correct"]}
+        for question_id, q in zip(question_ids, questions)
+        for a in q["answers"]
+    ]
+    if answers:
+        db.execute(insert(Answer), answers)
+    bump_quiz_list_version(db, user_id)
+    db.execute(record_stats(db, user_id, quizzes_created=1))
+    return quiz
+
+
+def bump_quiz_list_version(db: Session, user_id: int) -> None:
+    """Invalidate the ETag of ``user_id``'s quiz list; call on every quiz create or delete."""
+    db.execute(update(User).where(User.id == user_id).values(quiz_list_version=User.quiz_list_version + 1))
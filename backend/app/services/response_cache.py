@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    user_id: int
+    etag: str
+    body: bytes
+    expires_at: float
+
+
+class ResponseCache:
+    """Bounded per-process LRU of encoded response bodies with a TTL.
+
+    The TTL caps how long another worker's delete can go unnoticed, since
+    invalidation only reaches the worker that handled it.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, CachedResponse] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: int) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: int, user_id: int, etag: str, body: bytes) -> None:
+        if self.maxsize <= 0:
+            return
+        entry = CachedResponse(user_id, etag, body, time.monotonic() + self.ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: int) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(len(e.body) for e in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+quiz_details = ResponseCache(settings.QUIZ_DETAIL_CACHE_SIZE, settings.QUIZ_DETAIL_CACHE_TTL)
+quiz_analytics = ResponseCache(settings.QUIZ_ANALYTICS_CACHE_SIZE, settings.QUIZ_ANALYTICS_CACHE_TTL)
@@ -0,0 +1,68 @@
+"""Full-text search over quiz titles, questions and explanations.
+
+SQLite uses the ``quiz_search`` FTS5 table and Postgres the generated
+``search_vector`` columns, both created by migration 0005 and kept in sync
+by the database itself.
+"""
+
+import re
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# bm25() cannot be evaluated inside an aggregate; MATERIALIZED stops SQLite
+# from flattening the CTE into the GROUP BY
+_SQLITE_SEARCH = text("""
+    WITH matches AS MATERIALIZED (
+        SELECT quiz_id, bm25(quiz_search, 0.0, 10.0, 2.0, 1.0) AS rank
+        FROM quiz_search
+        WHERE quiz_search MATCH :match
+    )
+    SELECT quiz_id, MIN(rank) AS rank FROM matches
+    GROUP BY quiz_id
+    ORDER BY rank, quiz_id DESC
+    LIMIT :limit OFFSET :offset
+""")
+
+_POSTGRES_SEARCH = text("""
+    WITH query AS (SELECT websearch_to_tsquery('english', :q) AS tsq)
+    SELECT quiz_id, MAX(rank) AS rank FROM (
+        SELECT quizzes.id AS quiz_id, ts_rank(quizzes.search_vector, query.tsq) AS rank
+        FROM quizzes, query
+        WHERE quizzes.user_id = :user_id AND quizzes.search_vector @@ query.tsq
+        UNION ALL
+        SELECT questions.quiz_id, ts_rank(questions.search_vector, query.tsq)
+        FROM questions JOIN quizzes ON quizzes.id = questions.quiz_id, query
+        WHERE quizzes.user_id = :user_id AND questions.search_vector @@ query.tsq
+    ) AS matches
+    GROUP BY quiz_id
+    ORDER BY rank DESC, quiz_id DESC
+    LIMIT :limit OFFSET :offset
+""")
+
+
+def fts5_query(q: str, user_id: int) -> str | None:
+    """Turn free text into an FTS5 query scoped to one user's documents.
+
+    Every word must match (prefix match on the last one, for search-as-you-type);
+    quoting each token keeps FTS5 operators in user input inert.
+    """
+    tokens = re.findall(r"\w+", q.lower())
+    if not tokens:
+        return None
+    terms = " ".join(f'"{t}"' for t in tokens[:-1]) + f' "{tokens[-1]}"*'
+    return f'owner:"u{user_id}" AND {{title question_text explanation}}:({terms.strip()})'
+
+
+async def search_quiz_ids(db: AsyncSession, user_id: int, q: str, limit: int, offset: int) -> list[int]:
+    """Ids of the user's quizzes matching ``q``, best match first."""
+    conn = await db.connection()
+    if conn.dialect.name == "postgresql":
+        params = {"q": q, "user_id": user_id, "limit": limit, "offset": offset}
+        rows = await db.execute(_POSTGRES_SEARCH, params)
+    else:
+        match = fts5_query(q, user_id)
+        if match is None:
+            return []
+        rows = await db.execute(_SQLITE_SEARCH, {"match": match, "limit": limit, "offset": offset})
+    return [row.quiz_id for row in rows]
@@ -10,12 +10,12 @@ BUCKET_NAME = "quiz-images"
 PROFILE_BUCKET = "profile-pictures"
 
 
-def upload_to_supabase(filename: str, data: bytes, content_type: str) -> str:
+def upload_to_supabase(filename: str, data: bytes, content_type: str, upsert: bool = False) -> str:
     client = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
     client.storage.from_(BUCKET_NAME).upload(
         filename,
         data,
-        file_options={"content-type": content_type},
+        file_options={"content-type": content_type, "upsert": "true" if upsert else "false"},
     )
     return client.storage.from_(BUCKET_NAME).get_public_url(filename)
 
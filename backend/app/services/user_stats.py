@@ -0,0 +1,136 @@
+"""Statements that keep ``user_stats`` and ``user_daily_stats`` in step with
+quizzes and attempts.
+
+Each builder returns statements for the caller to execute in the same
+transaction as the change it records, from a sync or an async session.
+Daily buckets are UTC days.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timezone
+
+from sqlalchemy import Date, case, cast, delete, func, select, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+from app.models.daily_stats import UserDailyStats
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.models.user import User
+from app.models.user_stats import UserStats
+
+_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def attempt_percentage(score: int, total_questions: int) -> float:
+    return score / total_questions * 100 if total_questions > 0 else 0.0
+
+
+def attempt_day(completed_at: datetime) -> date:
+    if completed_at.tzinfo is not None:
+        completed_at = completed_at.astimezone(timezone.utc)
+    return completed_at.date()
+
+
+def _dialect_name(db) -> str:
+    # Sessions (sync or async) resolve their engine; a migration passes a Connection
+    return (db.dialect if isinstance(db, Connection) else db.get_bind().dialect).name
+
+
+def _insert(db, model=UserStats):
+    return _INSERTS[_dialect_name(db)](model)
+
+
+def _percentage():
+    return case(
+        (QuizAttempt.total_questions > 0, QuizAttempt.score * 100.0 / QuizAttempt.total_questions),
+        else_=0.0,
+    )
+
+
+def record_stats(db, user_id: int, quizzes_created: int = 0, percentages: list[float] = ()):
+    """Add newly created quizzes and submitted attempts to a user's totals."""
+    stmt = _insert(db).values(
+        user_id=user_id,
+        quizzes_created=quizzes_created,
+        attempts=len(percentages),
+        percentage_sum=sum(percentages),
+        best_percentage=max(percentages, default=0.0),
+    )
+    new = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[UserStats.user_id],
+        set_={
+            "quizzes_created": UserStats.quizzes_created + new.quizzes_created,
+            "attempts": UserStats.attempts + new.attempts,
+            "percentage_sum": UserStats.percentage_sum + new.percentage_sum,
+            "best_percentage": case(
+                (new.best_percentage > UserStats.best_percentage, new.best_percentage),
+                else_=UserStats.best_percentage,
+            ),
+        },
+    )
+
+
+def recompute_stats(db, user_id: int | None = None):
+    """Rebuild totals from the quizzes and attempts tables, for one user or all.
+
+    Needed after deletes: a quiz's attempts go with it, and a best score
+    cannot be decremented.
+    """
+    percentage = _percentage()
+    attempts = select(QuizAttempt).where(QuizAttempt.user_id == User.id)
+    source = select(
+        User.id,
+        select(func.count(Quiz.id)).where(Quiz.user_id == User.id).scalar_subquery(),
+        select(func.count(QuizAttempt.id)).where(QuizAttempt.user_id == User.id).scalar_subquery(),
+        attempts.with_only_columns(func.coalesce(func.sum(percentage), 0.0)).scalar_subquery(),
+        attempts.with_only_columns(func.coalesce(func.max(percentage), 0.0)).scalar_subquery(),
+    )
+    # SQLite needs a WHERE on INSERT ... SELECT ... ON CONFLICT to parse it
+    source = source.where(User.id == user_id if user_id is not None else true())
+    columns = ["user_id", "quizzes_created", "attempts", "percentage_sum", "best_percentage"]
+    stmt = _insert(db).from_select(columns, source)
+    return stmt.on_conflict_do_update(
+        index_elements=[UserStats.user_id],
+        set_={column: stmt.excluded[column] for column in columns[1:]},
+    )
+
+
+def record_daily_stats(db, user_id: int, attempts: list[tuple[datetime, float]]):
+    """Add ``(completed_at, percentage)`` attempts to their days' buckets in one upsert."""
+    buckets = defaultdict(lambda: [0, 0.0])
+    for completed_at, percentage in attempts:
+        bucket = buckets[attempt_day(completed_at)]
+        bucket[0] += 1
+        bucket[1] += percentage
+    stmt = _insert(db, UserDailyStats).values([
+        {"user_id": user_id, "day": day, "attempts": count, "percentage_sum": total}
+        for day, (count, total) in buckets.items()
+    ])
+    return stmt.on_conflict_do_update(
+        index_elements=[UserDailyStats.user_id, UserDailyStats.day],
+        set_={
+            "attempts": UserDailyStats.attempts + stmt.excluded.attempts,
+            "percentage_sum": UserDailyStats.percentage_sum + stmt.excluded.percentage_sum,
+        },
+    )
+
+
+def recompute_daily_stats(db, user_id: int | None = None) -> tuple:
+    """Delete and rebuild daily buckets from the attempts table, for one user or all."""
+    if _dialect_name(db) == "sqlite":
+        day = func.date(QuizAttempt.completed_at)
+    else:
+        day = cast(QuizAttempt.completed_at, Date)
+    source = select(QuizAttempt.user_id, day, func.count(), func.sum(_percentage())).group_by(
+        QuizAttempt.user_id, day
+    )
+    clear = delete(UserDailyStats)
+    if user_id is not None:
+        source = source.where(QuizAttempt.user_id == user_id)
+        clear = clear.where(UserDailyStats.user_id == user_id)
+    rebuild = _insert(db, UserDailyStats).from_select(
+        ["user_id", "day", "attempts", "percentage_sum"], source
+    )
+    return clear, rebuild
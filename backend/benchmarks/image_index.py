@@ -0,0 +1,67 @@
+"""Near-duplicate lookup latency in ``app.services.image_index``.
+
+Fills a ``HammingIndex`` with random 64-bit hashes, then times searches
+for planted near-duplicates against a linear scan, and times ``dhash``
+on a 12MP JPEG. Run from ``backend/``:
+
+    python -m benchmarks.image_index [--size N] [--distance D] [--queries Q]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.services.image_index import HammingIndex, hamming  # noqa: E402
+from app.services.image_prep import dhash  # noqa: E402
+from benchmarks.image_prep import synthetic_photo  # noqa: E402
+
+
+def timed(fn, runs: int) -> float:
+    """Median milliseconds per call."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.image_index")
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--distance", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    hashes = [rng.getrandbits(64) for _ in range(args.size)]
+    index = HammingIndex()
+    start = time.perf_counter()
+    for i, value in enumerate(hashes):
+        index.add(str(i), value)
+    print(f"built index of {args.size:,} hashes in {time.perf_counter() - start:.2f}s")
+
+    queries = []
+    for _ in range(args.queries):
+        query = rng.choice(hashes)
+        for bit in rng.sample(range(64), rng.randrange(args.distance + 1)):
+            query ^= 1 << bit
+        queries.append(query)
+
+    assert all(index.search(q, args.distance) for q in queries)
+    indexed = statistics.median(timed(lambda: index.search(q, args.distance), 1) for q in queries)
+    scan = statistics.median(
+        timed(lambda: [v for v in hashes if hamming(q, v) <= args.distance], 1) for q in queries[:10]
+    )
+    print(f"search within {args.distance} bits: index {indexed:.3f}ms, linear scan {scan:.1f}ms (median)")
+
+    _, photo, _ = synthetic_photo()
+    print(f"dhash of a 12MP JPEG: {timed(lambda: dhash(photo), 10):.1f}ms (median)")
+
+
+if __name__ == "__main__":
+    main()
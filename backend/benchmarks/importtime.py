@@ -0,0 +1,53 @@
+"""Profile what ``import app.main`` costs, using ``python -X importtime``.
+
+Run from ``backend/``:
+
+    python -m benchmarks.importtime [--top N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# SDKs that must only ever be imported inside the functions that use them
+HEAVY_MODULES = ("anthropic", "openai", "supabase", "resend", "PIL", "numpy", "app.services.mock_ai")
+
+
+def profile(module: str = "app.main") -> dict[str, tuple[int, int]]:
+    """Return ``{module: (self_us, cumulative_us)}`` for a fresh import of ``module``."""
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "importtime")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.importtime")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    timings = profile()
+    print(f"app.main: {timings['app.main'][1] / 1000:.1f}ms cumulative")
+    for name, (self_us, _) in sorted(timings.items(), key=lambda t: -t[1][0])[: args.top]:
+        print(f"{self_us / 1000:8.1f}ms  {name}")
+    loaded = [m for m in HEAVY_MODULES if m in timings]
+    if loaded:
+        print(f"heavy modules imported at startup: {', '.join(loaded)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Compare round trips and latency of quiz persistence strategies.
+
+``per_question`` is the old path (a flush per question to learn its id);
+``bulk`` is ``app.services.quiz_store.add_quiz``. Run from ``backend/``:
+
+    python -m benchmarks.quiz_insert [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.database import build_engine  # noqa: E402
+from app.migrations import upgrade  # noqa: E402
+from app.models.answer import Answer  # noqa: E402
+from app.models.question import Question  # noqa: E402
+from app.models.quiz import Quiz  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.quiz_store import add_quiz  # noqa: E402
+
+SIZES = (5, 50, 500)
+
+
+def make_questions(n: int) -> list[dict]:
+    return [
+        {
+            "question_text": f"Question {i}",
+            "explanation": f"Explanation {i}",
+            "correct_answer_index": 0,
+            "answers": [{"text": f"Answer {i}.{j}", "is_correct": j == 0} for j in range(4)],
+        }
+        for i in range(n)
+    ]
+
+
+def per_question(db, user_id: int, questions: list[dict]) -> Quiz:
+    quiz = Quiz(user_id=user_id, title="Benchmark", source_type="manual")
+    db.add(quiz)
+    db.flush()
+    for q in questions:
+        question = Question(
+            quiz_id=quiz.id,
+            question_text=q["question_text"],
+            explanation=q["explanation"],
+            correct_answer_index=q["correct_answer_index"],
+        )
+        db.add(question)
+        db.flush()
+        for a in q["answers"]:
+            db.add(Answer(question_id=question.id, answer_text=a["text"], is_correct=a["is_correct"]))
+    db.flush()
+    return quiz
+
+
+def bulk(db, user_id: int, questions: list[dict]) -> Quiz:
+    return add_quiz(db, user_id, "Benchmark", "manual", questions)
+
+
+def measure(Session, strategy, user_id: int, questions: list[dict], runs: int) -> tuple[int, float]:
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    engine = Session.kw["bind"]
+    event.listen(engine, "before_cursor_execute", count)
+    timings = []
+    try:
+        for _ in range(runs):
+            statements = 0
+            db = Session()
+            start = time.perf_counter()
+            strategy(db, user_id, questions)
+            db.commit()
+            timings.append(time.perf_counter() - start)
+            db.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return statements, statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.quiz_insert")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = build_engine(f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+    upgrade(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        user = User(email="bench@example.com", username="bench", password_hash="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    print(f"{'questions':>9}  {'strategy':<12} {'statements':>10}  {'median ms':>9}")
+    for n in SIZES:
+        questions = make_questions(n)
+        for name, strategy in (("per_question", per_question), ("bulk", bulk)):
+            statements, ms = measure(Session, strategy, user_id, questions, args.runs)
+            print(f"{n:>9}  {name:<12} {statements:>10}  {ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Time full-text quiz search on a synthetic corpus.
+
+Builds a SQLite database with ``--questions`` questions spread over 1000
+users (10 per quiz), then times ranked first-page searches for one user.
+Run from ``backend/``:
+
+    python -m benchmarks.search [--questions N] [--runs N]
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: E402
+
+from app.database import build_async_engine, build_engine  # noqa: E402
+from app.migrations import upgrade  # noqa: E402
+from app.models.question import Question  # noqa: E402
+from app.models.quiz import Quiz  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.search import search_quiz_ids  # noqa: E402
+
+USERS = 1000
+QUESTIONS_PER_QUIZ = 10
+# A Zipf-distributed vocabulary of pronounceable pseudo-words, so common
+# and rare terms behave roughly like real text
+_SYLLABLES = [c + v for c in "bdfgklmnprstvz" for v in "aeiou"]
+WORDS = [a + b + c for a in _SYLLABLES for b in _SYLLABLES for c in _SYLLABLES[:6]][:20000]
+CUM_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(WORDS) + 1)))
+QUERIES = (
+    WORDS[5],  # very common
+    WORDS[200],
+    f"{WORDS[50]} {WORDS[3000]}",
+    WORDS[10000],  # rare
+    WORDS[120][:4],  # prefix
+)
+
+
+def populate(engine, questions: int) -> None:
+    rng = random.Random(0)
+    quizzes = questions // QUESTIONS_PER_QUIZ
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [{"id": u, "email": f"u{u}@example.com", "username": f"u{u}"} for u in range(1, USERS + 1)],
+        )
+        conn.execute(
+            insert(Quiz),
+            [
+                {
+                    "id": q,
+                    "user_id": q % USERS + 1,
+                    "title": " ".join(rng.choices(WORDS, cum_weights=CUM_WEIGHTS, k=3)),
+                    "source_type": "manual",
+                }
+                for q in range(1, quizzes + 1)
+            ],
+        )
+        conn.execute(
+            insert(Question),
+            [
+                {
+                    "quiz_id": i // QUESTIONS_PER_QUIZ + 1,
+                    "question_text": " ".join(rng.choices(WORDS, cum_weights=CUM_WEIGHTS, k=8)),
+                    "explanation": " ".join(rng.choices(WORDS, cum_weights=CUM_WEIGHTS, k=12)),
+                    "correct_answer_index": 0,
+                }
+                for i in range(quizzes * QUESTIONS_PER_QUIZ)
+            ],
+        )
+
+
+async def run_queries(url: str, runs: int) -> list[float]:
+    engine = build_async_engine(url)
+    Session = async_sessionmaker(engine)
+    timings = []
+    async with Session() as db:
+        for _ in range(runs):
+            for q in QUERIES:
+                start = time.perf_counter()
+                await search_quiz_ids(db, user_id=1, q=q, limit=21, offset=0)
+                timings.append((time.perf_counter() - start) * 1000)
+    await engine.dispose()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.search")
+    parser.add_argument("--questions", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    url = f"sqlite:///{tempfile.mkdtemp()}/search.db"
+    engine = build_engine(url)
+    upgrade(engine)
+    start = time.perf_counter()
+    populate(engine, args.questions)
+    print(f"indexed {args.questions} questions in {time.perf_counter() - start:.1f}s")
+    engine.dispose()
+
+    timings = asyncio.run(run_queries(url, args.runs))
+    print(f"search: median {statistics.median(timings):.2f}ms  max {max(timings):.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare FastAPI's default response path with FastJSONResponse.
+
+``default`` is what a route with ``response_model`` does to a returned model:
+dump it, validate the dump against the response field, and encode with
+JSONResponse. ``fast`` is what FastRoute does for an exact model instance.
+Run from ``backend/``:
+
+    python -m benchmarks.serialization [--number N]
+"""
+
+import argparse
+import asyncio
+import os
+import timeit
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.responses import FastJSONResponse  # noqa: E402
+from app.schemas.attempt import AttemptResponse, StatsResponse  # noqa: E402
+from app.schemas.question import AnswerResponse, QuestionResponse  # noqa: E402
+from app.schemas.quiz import QuizDetail, QuizListResponse, QuizResponse  # noqa: E402
+
+NOW = datetime.now(timezone.utc)
+
+
+def payloads() -> dict:
+    detail = QuizDetail(
+        id=1,
+        title="Benchmark",
+        source_type="manual",
+        image_filename=None,
+        created_at=NOW,
+        questions=[
+            QuestionResponse(
+                id=q,
+                question_text=f"Question {q} " * 8,
+                explanation=f"Explanation {q} " * 12,
+                answers=[AnswerResponse(id=q * 4 + a, answer_text=f"Answer {a}", is_correct=a == 0) for a in range(4)],
+            )
+            for q in range(50)
+        ],
+    )
+    listing = QuizListResponse(
+        quizzes=[
+            QuizResponse(id=i, title=f"Quiz {i}", source_type="manual", question_count=10, created_at=NOW)
+            for i in range(20)
+        ],
+        total=200,
+        has_more=True,
+        next_cursor="abc",
+    )
+    stats = StatsResponse(
+        total_quizzes_created=200,
+        total_quizzes_taken=500,
+        average_score=72.5,
+        best_score=100.0,
+        recent_attempts=[
+            AttemptResponse(
+                id=i, quiz_id=i, quiz_title=f"Quiz {i}", score=7, total_questions=10, percentage=70.0, completed_at=NOW
+            )
+            for i in range(10)
+        ],
+    )
+    return {"QuizDetail": detail, "QuizListResponse": listing, "StatsResponse": stats}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization")
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    print(f"{'payload':<18} {'default us':>10} {'fast us':>10} {'speedup':>8}")
+    for name, model in payloads().items():
+        field = create_model_field(name="Response_" + name, type_=type(model), mode="serialization")
+
+        def default():
+            content = loop.run_until_complete(serialize_response(field=field, response_content=model))
+            return JSONResponse(content).body
+
+        def fast():
+            return FastJSONResponse(model).body
+
+        assert len(default()) > 0 and len(fast()) > 0
+        default_us = min(timeit.repeat(default, number=args.number, repeat=3)) / args.number * 1e6
+        fast_us = min(timeit.repeat(fast, number=args.number, repeat=3)) / args.number * 1e6
+        print(f"{name:<18} {default_us:>10.1f} {fast_us:>10.1f} {default_us / fast_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Measure cold-start cost: importing the app and running its lifespan.
+
+Each sample runs in a fresh interpreter so module caches do not carry over.
+Run from ``backend/``:
+
+    python -m benchmarks.startup [--runs N] [--database-url URL]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_PROBE = """
+import asyncio, json, time
+start = time.perf_counter()
+from app.main import app, lifespan
+imported = time.perf_counter()
+
+async def run():
+    async with lifespan(app):
+        pass
+
+asyncio.run(run())
+done = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "lifespan_ms": (done - imported) * 1000}))
+"""
+
+
+def sample(env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    env = dict(os.environ, LOG_LEVEL="WARNING")
+    env.setdefault("SECRET_KEY", "benchmark")
+    if args.database_url:
+        env["DATABASE_URL"] = args.database_url
+
+    first = sample(env)  # creates and migrates the database if needed
+    samples = [sample(env) for _ in range(args.runs)]
+    print(f"first run: import {first['import_ms']:.1f}ms, lifespan {first['lifespan_ms']:.1f}ms")
+    for key in ("import_ms", "lifespan_ms"):
+        values = [s[key] for s in samples]
+        print(f"{key:12} median {statistics.median(values):8.1f}  max {max(values):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,94 @@
+import glob
+import os
+import tempfile
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, StaticPool
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 
-from app.database import Base, get_db
+from app.database import (
+    build_async_engine,
+    build_engine,
+    get_async_db,
+    get_async_read_db,
+    get_async_read_sessionmaker,
+    get_async_write_db,
+    get_db,
+    get_read_db,
+    get_write_db,
+)
 from app.limiter import limiter
 from app.main import app
+from app.migrations import upgrade
+from app.services.answer_keys import answer_keys
+from app.services.image_index import near_duplicates
+from app.services.response_cache import quiz_analytics, quiz_details
 
 # Disable rate limiting for tests
 limiter.enabled = False
 
-engine = create_engine(
-    "sqlite://",
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
+# Sync and async routes must see the same data, so share a file database
+# instead of an in-memory one
+_db_path = os.path.join(tempfile.mkdtemp(), "test.db")
+
+engine = build_engine(f"sqlite:///{_db_path}")
 TestSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestWriteSession = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine.execution_options(sqlite_begin="IMMEDIATE")
+)
+
+# TestClient runs each request on its own event loop, so async connections
+# cannot be pooled across requests
+async_engine = build_async_engine(f"sqlite:///{_db_path}", mode="serverless")
+TestAsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+TestAsyncWriteSession = async_sessionmaker(
+    async_engine.execution_options(sqlite_begin="IMMEDIATE"), autoflush=False, expire_on_commit=False
+)
 
 
 @pytest.fixture(autouse=True)
 def setup_db():
-    Base.metadata.create_all(bind=engine)
+    upgrade(engine)
     yield
-    Base.metadata.drop_all(bind=engine)
+    answer_keys.clear()
+    quiz_details.clear()
+    quiz_analytics.clear()
+    near_duplicates.clear()
+    engine.dispose()
+    for path in glob.glob(f"{_db_path}*"):
+        os.remove(path)
+
+
+def _override(factory):
+    def override():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return override
+
+
+def _override_async(factory):
+    async def override():
+        async with factory() as db:
+            yield db
 
+    return override
 
-def override_get_db():
-    db = TestSession()
-    try:
-        yield db
-    finally:
-        db.close()
 
+override_get_db = _override(TestSession)
+override_get_async_db = _override_async(TestAsyncSession)
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+app.dependency_overrides[get_read_db] = override_get_db
+app.dependency_overrides[get_async_read_db] = override_get_async_db
+app.dependency_overrides[get_async_read_sessionmaker] = lambda: TestAsyncSession
+app.dependency_overrides[get_write_db] = _override(TestWriteSession)
+app.dependency_overrides[get_async_write_db] = _override_async(TestAsyncWriteSession)
 client = TestClient(app)
 
 
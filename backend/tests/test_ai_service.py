@@ -0,0 +1,361 @@
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from cryptography.fernet import Fernet
+from sqlalchemy import event
+
+from app.config import settings
+from app.models.generated_quiz import GeneratedQuizCache
+from app.models.quiz import Quiz
+from app.models.user import User
+from app.services import ai_service, generation
+from app.services.encryption import encrypt_value
+from app.services.image_index import near_duplicates
+from tests.conftest import TestSession, async_engine
+from tests.test_image_prep import encode, page
+
+QUIZ = {
+    "title": "Fake Provider Quiz",
+    "questions": [{
+        "question_text": "Q?",
+        "explanation": "E",
+        "correct_answer_index": 0,
+        "answers": [{"text": "A", "is_correct": True}, {"text": "B", "is_correct": False}],
+    }],
+}
+LATENCY = 0.3
+
+
+class FakeProvider(BaseHTTPRequestHandler):
+    """Answers the Anthropic messages and OpenAI chat completions endpoints after LATENCY."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.connections.add(self.client_address)
+        self.server.requests += 1
+        time.sleep(LATENCY)
+        key = self.headers.get("x-api-key") or self.headers.get("authorization", "").removeprefix("Bearer ")
+        if key != "good-key":
+            self._reply(401, {"type": "error", "error": {"type": "authentication_error", "message": "bad key"}})
+        elif self.path == "/v1/messages":
+            self._reply(200, {
+                "id": "msg_1", "type": "message", "role": "assistant", "model": "fake",
+                "content": [{"type": "text", "text": json.dumps(QUIZ)}],
+                "stop_reason": "end_turn", "stop_sequence": None,
+                "usage": {"input_tokens": 1, "output_tokens": 1},
+            })
+        else:
+            self._reply(200, {
+                "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "fake",
+                "choices": [{
+                    "index": 0, "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "```json\n" + json.dumps(QUIZ) + "\n```"},
+                }],
+            })
+
+    def _reply(self, status: int, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeProvider)
+    server.daemon_threads = True
+    server.connections = set()
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(settings, "ANTHROPIC_BASE_URL", url)
+    monkeypatch.setattr(settings, "OPENAI_BASE_URL", f"{url}/v1")
+    monkeypatch.setattr(ai_service, "clients", ai_service.ClientPool(4))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("name", ["claude", "openai"])
+def test_concurrent_generations_share_a_client(provider, name):
+    count = 10
+
+    async def run():
+        first = await asyncio.gather(*(
+            ai_service.generate_quiz(b"img", "image/png", name, "good-key") for _ in range(count)
+        ))
+        second = await asyncio.gather(*(
+            ai_service.generate_quiz(b"img", "image/png", name, "good-key") for _ in range(count)
+        ))
+        await ai_service.clients.aclose()
+        return first + second
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    assert all(r["title"] == QUIZ["title"] for r in results)
+    # Serial calls would take 2 * count * LATENCY
+    assert elapsed < 4 * LATENCY + 2
+    # The second wave rides the first wave's kept-alive connections
+    assert len(provider.connections) <= count
+
+
+def test_invalid_key(provider):
+    async def run():
+        try:
+            await ai_service.generate_quiz(b"img", "image/png", "claude", "bad-key")
+        finally:
+            await ai_service.clients.aclose()
+
+    with pytest.raises(ValueError, match="Invalid API key"):
+        asyncio.run(run())
+
+
+def test_client_pool_evicts_least_recently_used(provider):
+    async def get(pool, provider_name, key):
+        async with pool.use(provider_name, key) as client:
+            return client
+
+    async def run():
+        pool = ai_service.ClientPool(2)
+        a = await get(pool, "claude", "a")
+        b = await get(pool, "claude", "b")
+        assert await get(pool, "claude", "a") is a
+        await get(pool, "openai", "c")
+        assert len(pool) == 2
+        assert b.is_closed()
+        assert await get(pool, "claude", "a") is a
+        await pool.aclose()
+        assert a.is_closed()
+
+    asyncio.run(run())
+
+
+def test_evicted_client_finishes_in_flight_request(provider, monkeypatch):
+    monkeypatch.setattr(ai_service, "clients", ai_service.ClientPool(1))
+
+    async def evict_midway():
+        await asyncio.sleep(LATENCY / 3)
+        return await ai_service.generate_quiz(b"img", "image/png", "openai", "good-key")
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                ai_service.generate_quiz(b"img", "image/png", "claude", "good-key"), evict_midway()
+            )
+        finally:
+            await ai_service.clients.aclose()
+
+    assert [quiz["title"] for quiz in asyncio.run(run())] == [QUIZ["title"]] * 2
+
+
+def _use_provider(monkeypatch, tmp_path, cache_opt_out=False):
+    monkeypatch.setattr(generation, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "ENCRYPTION_KEY", Fernet.generate_key().decode())
+    db = TestSession()
+    try:
+        user = db.query(User).filter_by(username="testuser").one()
+        user.ai_provider = "openai"
+        user.ai_api_key_encrypted = encrypt_value("good-key")
+        user.ai_cache_opt_out = cache_opt_out
+        db.commit()
+    finally:
+        db.close()
+
+
+def _upload(auth_client, contents=b"\x89PNG\r\n\x1a\n"):
+    return auth_client.post(
+        "/api/v1/quizzes/generate-from-image", files={"file": ("page.png", contents, "image/png")}
+    )
+
+
+def test_generate_from_image_with_provider(auth_client, provider, monkeypatch, tmp_path):
+    _use_provider(monkeypatch, tmp_path)
+    res = _upload(auth_client)
+    assert res.status_code == 200
+    assert res.json()["title"] == QUIZ["title"]
+    assert res.json()["question_count"] == 1
+
+
+def test_generation_holds_no_connections_during_model_call(auth_client, monkeypatch, tmp_path):
+    monkeypatch.setattr(generation, "UPLOAD_DIR", str(tmp_path))
+    pool = async_engine.sync_engine.pool
+    checked_out = []
+    real = generation.generate_quiz_data
+
+    def checkout(*args):
+        checked_out.append(1)
+
+    def checkin(*args):
+        checked_out.pop()
+
+    async def model_call(*args):
+        assert checked_out == []
+        return await real(*args)
+
+    monkeypatch.setattr(generation, "generate_quiz_data", model_call)
+    event.listen(pool, "checkout", checkout)
+    event.listen(pool, "checkin", checkin)
+    try:
+        assert _upload(auth_client).status_code == 200
+    finally:
+        event.remove(pool, "checkout", checkout)
+        event.remove(pool, "checkin", checkin)
+
+
+def test_generated_quiz_without_questions(auth_client, monkeypatch, tmp_path):
+    monkeypatch.setattr(generation, "UPLOAD_DIR", str(tmp_path))
+
+    async def empty_quiz(*args):
+        return {"title": "Blank page", "questions": []}
+
+    monkeypatch.setattr(generation, "generate_quiz_data", empty_quiz)
+    res = _upload(auth_client)
+    assert res.status_code == 200
+    assert res.json()["question_count"] == 0
+
+
+def test_identical_uploads_reuse_generated_quiz(auth_client, provider, monkeypatch, tmp_path):
+    _use_provider(monkeypatch, tmp_path)
+    ids = [_upload(auth_client).json()["id"] for _ in range(3)]
+
+    assert len(set(ids)) == 3
+    assert provider.requests == 1
+    digest = hashlib.sha256(b"\x89PNG\r\n\x1a\n").hexdigest()
+    assert os.listdir(tmp_path) == [f"{digest}.png"]
+    db = TestSession()
+    try:
+        assert {q.image_filename for q in db.query(Quiz)} == {f"{digest}.png"}
+        assert db.get(GeneratedQuizCache, digest).hits == 2
+    finally:
+        db.close()
+
+
+def test_cache_opt_out(auth_client, provider, monkeypatch, tmp_path):
+    _use_provider(monkeypatch, tmp_path, cache_opt_out=True)
+    assert auth_client.get("/api/v1/settings").json()["ai_cache_opt_out"] is True
+    for _ in range(2):
+        assert _upload(auth_client).status_code == 200
+
+    assert provider.requests == 2
+    assert len(os.listdir(tmp_path)) == 2
+    db = TestSession()
+    try:
+        assert db.query(GeneratedQuizCache).count() == 0
+    finally:
+        db.close()
+
+    res = auth_client.put("/api/v1/settings", json={"ai_cache_opt_out": False})
+    assert res.json()["ai_cache_opt_out"] is False
+
+
+def test_cache_expires_and_evicts_least_recently_used(auth_client, provider, monkeypatch, tmp_path):
+    _use_provider(monkeypatch, tmp_path)
+    monkeypatch.setattr(settings, "GENERATED_QUIZ_CACHE_SIZE", 2)
+    for image in (b"one", b"two", b"one", b"three"):
+        assert _upload(auth_client, image).status_code == 200
+    assert provider.requests == 3
+
+    db = TestSession()
+    try:
+        kept = {hashlib.sha256(image).hexdigest() for image in (b"one", b"three")}
+        assert {entry.content_hash for entry in db.query(GeneratedQuizCache)} == kept
+        entry = db.get(GeneratedQuizCache, hashlib.sha256(b"one").hexdigest())
+        entry.last_used_at = datetime.now(timezone.utc) - timedelta(seconds=settings.GENERATED_QUIZ_CACHE_TTL + 1)
+        db.commit()
+    finally:
+        db.close()
+
+    assert _upload(auth_client, b"one").status_code == 200
+    assert provider.requests == 4
+
+
+def _similar(auth_client, contents):
+    res = auth_client.post("/api/v1/quizzes/similar", files={"file": ("page.jpg", contents, "image/jpeg")})
+    assert res.status_code == 200
+    return res.json()["match"]
+
+
+def test_near_duplicate_is_offered_not_reused(auth_client, provider, monkeypatch, tmp_path):
+    _use_provider(monkeypatch, tmp_path)
+    original = encode(page(1), "PNG")
+    assert _upload(auth_client, original).status_code == 200
+    assert _similar(auth_client, original) is None  # exact matches are reused without asking
+
+    reshot = encode(page(1).rotate(1, fillcolor="white"), quality=60)
+    match = _similar(auth_client, reshot)
+    assert match["content_hash"] == hashlib.sha256(original).hexdigest()
+    assert match["title"] == QUIZ["title"]
+    assert match["question_count"] == 1
+    assert match["distance"] <= settings.NEAR_DUPLICATE_DISTANCE
+
+    # Without accepting the offer, the upload gets its own generation
+    assert _upload(auth_client, reshot).status_code == 200
+    assert provider.requests == 2
+
+    # Accepting it reuses the quiz but keeps the user's own image
+    rescaled = encode(page(1).resize((800, 1067)))
+    res = auth_client.post(
+        "/api/v1/quizzes/generate-from-image",
+        files={"file": ("page.jpg", rescaled, "image/jpeg")},
+        data={"reuse": match["content_hash"]},
+    )
+    assert res.status_code == 200
+    assert provider.requests == 2
+    own_image = f"{hashlib.sha256(rescaled).hexdigest()}.jpg"
+    assert own_image in os.listdir(tmp_path)
+    db = TestSession()
+    try:
+        assert db.get(Quiz, res.json()["id"]).image_filename == own_image
+        assert db.get(GeneratedQuizCache, match["content_hash"]).hits == 1
+    finally:
+        db.close()
+
+    # A reuse hash for an unrelated image is ignored
+    res = auth_client.post(
+        "/api/v1/quizzes/generate-from-image",
+        files={"file": ("page.jpg", encode(page(2)), "image/jpeg")},
+        data={"reuse": match["content_hash"]},
+    )
+    assert res.status_code == 200
+    assert provider.requests == 3
+
+
+def test_near_duplicate_index_rebuilds_from_database(auth_client, provider, monkeypatch, tmp_path):
+    _use_provider(monkeypatch, tmp_path)
+    assert _upload(auth_client, encode(page(1), "PNG")).status_code == 200
+
+    near_duplicates.clear()  # as after a restart
+    assert _similar(auth_client, encode(page(1), quality=50)) is not None
+    assert len(near_duplicates) == 1
+    assert _similar(auth_client, encode(page(2))) is None
+
+    monkeypatch.setattr(settings, "NEAR_DUPLICATE_DISTANCE", 0)
+    assert _similar(auth_client, encode(page(1), quality=50)) is None
+
+
+def test_near_duplicate_lookup_without_pillow(auth_client, provider, monkeypatch, tmp_path):
+    _use_provider(monkeypatch, tmp_path)
+    assert _upload(auth_client, encode(page(1), "PNG")).status_code == 200
+
+    reshot = encode(page(1), quality=50)
+    monkeypatch.setitem(sys.modules, "PIL", None)
+    assert _similar(auth_client, reshot) is None
+    assert _upload(auth_client, reshot).status_code == 200
+    assert provider.requests == 2
@@ -0,0 +1,189 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+import app.database
+from app.database import (
+    Base,
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    RecentWrites,
+    async_url,
+    build_async_engine,
+    build_engine,
+    choose_sessionmaker,
+    pool_stats,
+)
+from app.models.user import User
+from tests.conftest import TestSession
+
+
+def test_queue_mode_uses_instrumented_pool(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path}/pool.db", mode="queue")
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+
+    before = pool_stats.snapshot()
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    after = pool_stats.snapshot()
+
+    # Connections are reused between checkouts instead of reopened
+    assert after["checkouts"] - before["checkouts"] == 3
+    assert after["connects"] - before["connects"] == 1
+    engine.dispose()
+
+
+def test_serverless_mode_uses_null_pool(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path}/pool.db", mode="serverless")
+    assert isinstance(engine.pool, NullPool)
+    engine.dispose()
+
+
+def test_async_url():
+    assert async_url("sqlite:///./qwiz_me.db") == "sqlite+aiosqlite:///./qwiz_me.db"
+    assert async_url("postgresql://u:p@h/db") == "postgresql+psycopg://u:p@h/db"
+
+
+def test_async_engine_shares_pool_mode(tmp_path):
+    engine = build_async_engine(f"sqlite:///{tmp_path}/pool.db", mode="queue")
+    assert isinstance(engine.sync_engine.pool, InstrumentedAsyncQueuePool)
+
+    async def run():
+        async def query():
+            async with engine.connect() as conn:
+                return await conn.scalar(text("SELECT 1"))
+
+        results = await asyncio.gather(*(query() for _ in range(10)))
+        await engine.dispose()
+        return results
+
+    assert asyncio.run(run()) == [1] * 10
+
+
+def test_sqlite_profile_pragmas(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path}/profile.db")
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() > 0
+    engine.dispose()
+
+
+def test_sqlite_write_sessions_serialize(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path}/writers.db")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE hits (id INTEGER PRIMARY KEY, seen INTEGER)"))
+    WriteSession = sessionmaker(bind=engine.execution_options(sqlite_begin="IMMEDIATE"))
+    errors = []
+
+    def writer():
+        for _ in range(20):
+            try:
+                with WriteSession() as db:
+                    # Read-then-write, like submit_quiz loading the quiz before inserting
+                    seen = db.execute(text("SELECT count(*) FROM hits")).scalar()
+                    time.sleep(0.001)
+                    db.execute(text("INSERT INTO hits (seen) VALUES (:seen)"), {"seen": seen})
+                    db.commit()
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+    threads = [threading.Thread(target=writer) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM hits")).scalar() == 160
+        # Each writer saw every earlier commit: no lost updates
+        assert conn.execute(text("SELECT count(DISTINCT seen) FROM hits")).scalar() == 160
+    engine.dispose()
+
+
+def test_unknown_pool_mode(tmp_path):
+    with pytest.raises(ValueError):
+        build_engine(f"sqlite:///{tmp_path}/pool.db", mode="bogus")
+
+
+def test_metrics_requires_admin(auth_client):
+    res = auth_client.get("/api/v1/admin/metrics")
+    assert res.status_code == 403
+
+
+def test_metrics_exposes_pool_stats(auth_client):
+    db = TestSession()
+    db.query(User).filter(User.email == "test@example.com").update({"role": "admin"})
+    db.commit()
+    db.close()
+
+    res = auth_client.get("/api/v1/admin/metrics")
+    assert res.status_code == 200
+    stats = res.json()["db_pool"]
+    assert stats["mode"] == "queue"
+    for key in ("checkouts", "connects", "timeouts", "wait_ms_avg", "wait_ms_max"):
+        assert key in stats
+    assert {"hits", "misses", "entries"} <= set(res.json()["quiz_detail_cache"])
+
+
+@pytest.fixture
+def primary_and_replica(tmp_path, monkeypatch):
+    monkeypatch.setattr(app.database, "recent_writes", RecentWrites(60))
+    factories = []
+    for name in ("primary", "replica"):
+        engine = build_engine(f"sqlite:///{tmp_path}/{name}.db")
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine)
+        with factory() as db:
+            db.add(User(id=1, username=name))
+            db.commit()
+        factories.append(factory)
+    yield factories
+    for factory in factories:
+        factory.kw["bind"].dispose()
+
+
+def _read_username(primary, replica, user_id=1):
+    with choose_sessionmaker(primary, [replica], user_id)() as db:
+        return db.get(User, 1).username
+
+
+def test_reads_go_to_replica(primary_and_replica):
+    primary, replica = primary_and_replica
+    assert _read_username(primary, replica) == "replica"
+    assert choose_sessionmaker(primary, [], 1) is primary
+
+
+def test_reads_stick_to_primary_after_write(primary_and_replica, monkeypatch):
+    primary, replica = primary_and_replica
+
+    with primary() as db:
+        db.info["user_id"] = 1
+        db.get(User, 1).first_name = "Ada"
+        db.commit()
+
+    assert _read_username(primary, replica) == "primary"
+    # Other users are unaffected by this user's write
+    assert _read_username(primary, replica, user_id=2) == "replica"
+
+    monkeypatch.setattr(app.database.recent_writes, "window", 0)
+    assert _read_username(primary, replica) == "replica"
+
+
+def test_read_only_commit_does_not_pin_primary(primary_and_replica):
+    primary, replica = primary_and_replica
+
+    with primary() as db:
+        db.info["user_id"] = 1
+        db.get(User, 1)
+        db.commit()
+
+    assert _read_username(primary, replica) == "replica"
@@ -0,0 +1,156 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from app.config import settings
+from app.models.generation_job import GenerationJob
+from app.models.quiz import Quiz
+from app.models.user import User
+from app.services import generation
+from app.services.generation_jobs import JobRunner
+from tests.conftest import TestAsyncWriteSession, TestSession
+
+IMAGE = {"file": ("notes.png", b"\x89PNG\r\n\x1a\n", "image/png")}
+
+
+@pytest.fixture(autouse=True)
+def uploads(monkeypatch, tmp_path):
+    monkeypatch.setattr(generation, "UPLOAD_DIR", str(tmp_path))
+
+
+def run_jobs() -> int:
+    return asyncio.run(JobRunner(TestAsyncWriteSession, 1, 0.1).drain())
+
+
+def set_job(job_id: int, **values):
+    db = TestSession()
+    try:
+        db.execute(update(GenerationJob).where(GenerationJob.id == job_id).values(**values))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_job_lifecycle(auth_client):
+    res = auth_client.post("/api/v1/quizzes/jobs", files=IMAGE)
+    assert res.status_code == 202
+    job = res.json()
+    assert job["status"] == "queued"
+    assert res.headers["location"] == f"/api/v1/quizzes/jobs/{job['id']}"
+    assert auth_client.get(f"/api/v1/quizzes/jobs/{job['id']}").json()["status"] == "queued"
+
+    assert run_jobs() == 1
+    assert run_jobs() == 0
+
+    job = auth_client.get(f"/api/v1/quizzes/jobs/{job['id']}").json()
+    assert job["status"] == "succeeded"
+    assert job["error"] is None
+    quiz = auth_client.get(f"/api/v1/quizzes/{job['quiz_id']}").json()
+    assert quiz["source_type"] == "ai_generated"
+
+
+def test_job_events_stream(auth_client):
+    job_id = auth_client.post("/api/v1/quizzes/jobs", files=IMAGE).json()["id"]
+    run_jobs()
+
+    res = auth_client.get(f"/api/v1/quizzes/jobs/{job_id}/events")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/event-stream")
+    assert res.text.startswith("event: status\ndata: ")
+    assert '"status":"succeeded"' in res.text
+
+
+def test_job_records_failure(auth_client):
+    db = TestSession()
+    try:
+        user = db.query(User).filter_by(username="testuser").one()
+        user.ai_provider = "claude"
+        user.ai_api_key_encrypted = "not-decryptable"
+        db.commit()
+    finally:
+        db.close()
+
+    job_id = auth_client.post("/api/v1/quizzes/jobs", files=IMAGE).json()["id"]
+    run_jobs()
+
+    job = auth_client.get(f"/api/v1/quizzes/jobs/{job_id}").json()
+    assert job["status"] == "failed"
+    assert job["error"].startswith("AI configuration error")
+    assert job["quiz_id"] is None
+
+
+def test_abandoned_job_is_retried(auth_client):
+    job_id = auth_client.post("/api/v1/quizzes/jobs", files=IMAGE).json()["id"]
+    expired = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+    # A worker died mid-generation; its lease has run out
+    set_job(job_id, status="generating", attempts=1, lease_expires_at=expired)
+    assert run_jobs() == 1
+    assert auth_client.get(f"/api/v1/quizzes/jobs/{job_id}").json()["status"] == "succeeded"
+
+
+def test_job_gives_up_after_max_attempts(auth_client):
+    job_id = auth_client.post("/api/v1/quizzes/jobs", files=IMAGE).json()["id"]
+    expired = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+    set_job(job_id, status="generating", attempts=3, lease_expires_at=expired)
+    run_jobs()
+    assert auth_client.get(f"/api/v1/quizzes/jobs/{job_id}").json()["status"] == "failed"
+
+
+def test_running_job_is_not_claimed_twice(auth_client):
+    job_id = auth_client.post("/api/v1/quizzes/jobs", files=IMAGE).json()["id"]
+    leased = datetime.now(timezone.utc) + timedelta(minutes=5)
+
+    set_job(job_id, status="generating", attempts=1, lease_expires_at=leased)
+    assert run_jobs() == 0
+
+
+def test_job_taken_over_mid_run_saves_one_quiz(auth_client, monkeypatch):
+    job_id = auth_client.post("/api/v1/quizzes/jobs", files=IMAGE).json()["id"]
+    real = generation.generate_quiz_data
+    calls = []
+
+    async def slow_generation(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            # The first worker stalls past its lease and a second one claims the job
+            set_job(job_id, lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+            assert await JobRunner(TestAsyncWriteSession, 1, 0.1).run_next()
+        return await real(*args)
+
+    monkeypatch.setattr(generation, "generate_quiz_data", slow_generation)
+    assert run_jobs() == 1
+
+    assert len(calls) == 2
+    job = auth_client.get(f"/api/v1/quizzes/jobs/{job_id}").json()
+    assert job["status"] == "succeeded"
+    db = TestSession()
+    try:
+        assert [quiz.id for quiz in db.query(Quiz)] == [job["quiz_id"]]
+        assert db.get(GenerationJob, job_id).attempts == 2
+    finally:
+        db.close()
+
+
+def test_lease_is_renewed_during_slow_generation(auth_client, monkeypatch):
+    monkeypatch.setattr(settings, "GENERATION_JOB_LEASE_SECONDS", 0.3)
+    job_id = auth_client.post("/api/v1/quizzes/jobs", files=IMAGE).json()["id"]
+    real = generation.generate_quiz_data
+
+    async def slow_generation(*args):
+        await asyncio.sleep(0.8)
+        # Still leased, so nobody else picks it up
+        assert not await JobRunner(TestAsyncWriteSession, 1, 0.1).run_next()
+        return await real(*args)
+
+    monkeypatch.setattr(generation, "generate_quiz_data", slow_generation)
+    assert run_jobs() == 1
+    assert auth_client.get(f"/api/v1/quizzes/jobs/{job_id}").json()["status"] == "succeeded"
+
+
+def test_job_not_found(auth_client):
+    assert auth_client.get("/api/v1/quizzes/jobs/9999").status_code == 404
+    assert auth_client.get("/api/v1/quizzes/jobs/9999/events").status_code == 404
@@ -0,0 +1,42 @@
+import random
+
+from app.services.image_index import HammingIndex, hamming, to_signed, to_unsigned
+
+
+def test_search_matches_brute_force():
+    rng = random.Random(7)
+    hashes = {f"k{i}": rng.getrandbits(64) for i in range(2000)}
+    # Plant near neighbours of a query
+    query = rng.getrandbits(64)
+    for distance in range(9):
+        flipped = query
+        for bit in rng.sample(range(64), distance):
+            flipped ^= 1 << bit
+        hashes[f"near{distance}"] = flipped
+
+    index = HammingIndex()
+    for key, value in hashes.items():
+        index.add(key, value)
+
+    for max_distance in (0, 3, 5, 8):
+        expected = sorted((hamming(query, v), k) for k, v in hashes.items() if hamming(query, v) <= max_distance)
+        assert index.search(query, max_distance) == expected
+
+
+def test_remove_and_replace():
+    index = HammingIndex()
+    index.add("a", 0b1011)
+    index.add("a", 0b1111)
+    assert len(index) == 1
+    assert index.search(0b1111, 0) == [(0, "a")]
+    index.remove("a")
+    index.remove("a")
+    assert len(index) == 0
+    assert index.search(0b1111, 4) == []
+
+
+def test_signed_round_trip():
+    for value in (0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1):
+        stored = to_signed(value)
+        assert -(1 << 63) <= stored < 1 << 63
+        assert to_unsigned(stored) == value
@@ -0,0 +1,88 @@
+import asyncio
+import random
+import sys
+from io import BytesIO
+
+from PIL import Image, ImageDraw
+
+from app.services.image_index import hamming
+from app.services.image_prep import dhash, prepare_for_provider, prepare_image, target_size
+
+
+def jpeg(size, **save_args) -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", size, "teal").save(buf, format="JPEG", **save_args)
+    return buf.getvalue()
+
+
+def page(seed: int) -> Image.Image:
+    """A textbook-like page: lines of "text" and the odd figure."""
+    rng = random.Random(seed)
+    img = Image.new("RGB", (1200, 1600), "white")
+    draw = ImageDraw.Draw(img)
+    y = 100
+    while y < 1450:
+        if rng.random() < 0.15:
+            x = rng.randrange(100, 600)
+            draw.rectangle((x, y, x + rng.randrange(150, 500), y + rng.randrange(100, 300)), fill=rng.randrange(200))
+            y += 340
+        else:
+            draw.rectangle((100, y, 100 + rng.randrange(300, 1000), y + 14), fill=rng.randrange(100))
+            y += 30
+    return img
+
+
+def encode(img: Image.Image, fmt: str = "JPEG", **save_args) -> bytes:
+    buf = BytesIO()
+    img.save(buf, format=fmt, **save_args)
+    return buf.getvalue()
+
+
+def test_target_size_respects_provider_limits():
+    assert target_size(4000, 3000, "claude") == (1238, 929)  # ~1.15 megapixels
+    assert target_size(4000, 3000, "openai") == (1024, 768)  # 768px short side
+    assert target_size(800, 600, "claude") == (800, 600)
+
+
+def test_prepare_image_downsizes_and_strips_exif():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # stored sideways, displayed rotated 90 degrees
+    exif[0x010F] = "Phone"
+    prepared = prepare_image(jpeg((4000, 3000), exif=exif), "image/jpeg", "openai")
+
+    assert prepared.media_type == "image/webp"
+    img = Image.open(BytesIO(prepared.data))
+    assert img.size == (768, 1024) == (prepared.width, prepared.height)  # upright
+    assert not img.getexif()
+
+
+def test_small_clean_image_is_sent_as_is():
+    buf = BytesIO()
+    Image.new("P", (4, 4)).save(buf, format="GIF")
+    contents = buf.getvalue()
+    assert prepare_image(contents, "image/gif", "claude") is None
+    assert asyncio.run(prepare_for_provider(contents, "image/gif", "claude")) == (contents, "image/gif")
+
+
+def test_undecodable_upload_is_sent_as_is():
+    assert asyncio.run(prepare_for_provider(b"not an image", "image/png", "openai")) == (b"not an image", "image/png")
+
+
+def test_dhash_matches_reshot_pages():
+    original = page(1)
+    h = dhash(encode(original, "PNG"))
+    reshot = [
+        encode(original, quality=40),
+        encode(original.resize((700, 933)), quality=85),
+        encode(original.rotate(1.5, fillcolor="white")),
+        encode(original.crop((20, 25, 1180, 1575))),
+    ]
+    assert all(hamming(h, dhash(image)) <= 5 for image in reshot)
+    assert min(hamming(h, dhash(encode(page(seed)))) for seed in range(2, 20)) > 5
+    assert dhash(b"not an image") is None
+
+
+def test_original_is_sent_without_pillow(monkeypatch):
+    contents = jpeg((4000, 3000))
+    monkeypatch.setitem(sys.modules, "PIL", None)
+    assert asyncio.run(prepare_for_provider(contents, "image/jpeg", "claude")) == (contents, "image/jpeg")
@@ -0,0 +1,14 @@
+from benchmarks.importtime import HEAVY_MODULES, profile
+
+# Generous enough for a slow CI runner; a stray SDK import blows well past it
+IMPORT_BUDGET_MS = 3000
+
+
+def test_app_import_skips_heavy_modules():
+    timings = profile("app.main")
+    assert [m for m in HEAVY_MODULES if m in timings] == []
+
+
+def test_app_import_within_budget():
+    timings = profile("app.main")
+    assert timings["app.main"][1] / 1000 < IMPORT_BUDGET_MS
@@ -0,0 +1,19 @@
+from app.manage import assign_founder
+from app.models.user import User
+from tests.conftest import TestSession
+
+
+def test_assign_founder(test_client):
+    test_client.post("/api/v1/auth/register", json={
+        "email": "Owner@Example.com",
+        "username": "owner",
+        "password": "password123",
+    })
+
+    db = TestSession()
+    try:
+        assert assign_founder(db, "owner@example.com")
+        assert db.query(User).filter_by(username="owner").one().role == "founder"
+        assert not assign_founder(db, "nobody@example.com")
+    finally:
+        db.close()
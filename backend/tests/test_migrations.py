@@ -0,0 +1,78 @@
+from sqlalchemy import create_engine, inspect, text
+
+from app.migrations import applied_revisions, current_revision, head, is_current, upgrade
+from app.migrations.plan_check import _is_sequential_scan, find_sequential_scans
+
+COMPOSITE_INDEXES = {
+    "quizzes": "ix_quizzes_user_id_created_at_id",
+    "quiz_attempts": "ix_quiz_attempts_user_id_completed_at",
+    "answers": "ix_answers_question_id_id",
+    "verification_codes": "ix_verification_codes_user_id_purpose_created_at",
+}
+
+
+def _index_names(engine, table):
+    return {ix["name"] for ix in inspect(engine).get_indexes(table)}
+
+
+def test_upgrade_fresh_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/fresh.db")
+    assert upgrade(engine) == list(range(1, head() + 1))
+    assert upgrade(engine) == []
+
+    with engine.connect() as conn:
+        assert applied_revisions(conn) == set(range(1, head() + 1))
+    for table, index in COMPOSITE_INDEXES.items():
+        assert index in _index_names(engine, table)
+
+
+def test_upgrade_adds_indexes_to_existing_schema(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    upgrade(engine)
+    # Simulate a database created by the old create_all-only init_db
+    with engine.begin() as conn:
+        for index in COMPOSITE_INDEXES.values():
+            conn.execute(text(f"DROP INDEX {index}"))
+        conn.execute(text("DROP TABLE schema_migrations"))
+
+    upgrade(engine)
+    for table, index in COMPOSITE_INDEXES.items():
+        assert index in _index_names(engine, table)
+
+
+def test_hot_queries_use_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/plans.db")
+    upgrade(engine)
+    assert find_sequential_scans(engine) == {}
+
+
+def test_plan_check_detects_sequential_scan(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/plans.db")
+    upgrade(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_quizzes_user_id_created_at_id"))
+        conn.execute(text("DROP INDEX ix_quizzes_user_id"))
+
+    assert set(find_sequential_scans(engine)) == {"list_quizzes"}
+
+
+def test_plan_check_allows_index_scans():
+    assert _is_sequential_scan("SCAN quizzes")
+    assert _is_sequential_scan("Seq Scan on quizzes  (cost=0.00..1.01 rows=1 width=4)")
+    assert not _is_sequential_scan("SCAN quizzes USING COVERING INDEX ix_quizzes_user_id_created_at_id")
+    assert not _is_sequential_scan("SCAN answers USING INDEX ix_answers_question_id_id")
+    assert not _is_sequential_scan("SEARCH quizzes USING INDEX ix_quizzes_user_id (user_id=?)")
+
+
+def test_is_current(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/stamp.db")
+    assert current_revision(engine) is None
+    assert not is_current(engine)
+
+    upgrade(engine)
+    assert current_revision(engine) == head()
+    assert is_current(engine)
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM schema_migrations WHERE revision = :r"), {"r": head()})
+    assert not is_current(engine)
@@ -57,6 +57,30 @@ def test_pagination(auth_client):
     assert data2["has_more"] is False
 
 
+def test_cursor_pagination(auth_client):
+    for i in range(5):
+        auth_client.post("/api/v1/quizzes", json={**SAMPLE_QUIZ, "title": f"Quiz {i}"})
+
+    titles = []
+    params = {"cursor": "", "limit": 2, "include_total": False}
+    while True:
+        data = auth_client.get("/api/v1/quizzes", params=params).json()
+        assert data["total"] is None
+        assert all(q["question_count"] == 2 for q in data["quizzes"])
+        titles += [q["title"] for q in data["quizzes"]]
+        if not data["has_more"]:
+            assert data["next_cursor"] is None
+            break
+        params["cursor"] = data["next_cursor"]
+
+    assert titles == [f"Quiz {i}" for i in reversed(range(5))]
+
+
+def test_invalid_cursor(auth_client):
+    res = auth_client.get("/api/v1/quizzes", params={"cursor": "not-a-cursor"})
+    assert res.status_code == 400
+
+
 def test_get_quiz(auth_client):
     create_res = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ)
     quiz_id = create_res.json()["id"]
@@ -111,3 +135,323 @@ def test_submit_wrong_count(auth_client):
 def test_quiz_not_found(auth_client):
     res = auth_client.get("/api/v1/quizzes/9999")
     assert res.status_code == 404
+
+
+def _statement_count(auth_client, quiz):
+    from sqlalchemy import event
+
+    from tests.conftest import engine
+
+    statements = []
+    listener = lambda conn, cursor, stmt, *args: statements.append(stmt)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert auth_client.post("/api/v1/quizzes", json=quiz).status_code == 201
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return len(statements)
+
+
+def test_create_quiz_statement_count_is_constant(auth_client):
+    def quiz(n):
+        return {**SAMPLE_QUIZ, "questions": SAMPLE_QUIZ["questions"] * (n // 2)}
+
+    assert _statement_count(auth_client, quiz(4)) == _statement_count(auth_client, quiz(50))
+
+
+def test_create_quiz_preserves_order(auth_client):
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    questions = auth_client.get(f"/api/v1/quizzes/{quiz_id}").json()["questions"]
+    assert [q["question_text"] for q in questions] == ["What is 2+2?", "What color is the sky?"]
+    assert [a["answer_text"] for a in questions[1]["answers"]] == ["Blue", "Red"]
+
+
+def test_answer_key_scoring():
+    from app.services.answer_keys import AnswerKey
+
+    # Q1: answer 0 correct; Q2: answers 1 and 2 correct; Q3: no answers
+    key = AnswerKey(user_id=1, title="t", correct=(0b001, 0b110, 0))
+    assert key.score([0, 2, 0]) == 2
+    assert key.score([1, 0, 0]) == 0
+    assert key.score([-1, 9, 0]) == 0
+
+
+def test_submit_after_delete_invalidates_key(auth_client):
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    assert auth_client.post(f"/api/v1/quizzes/{quiz_id}/submit", json={"answers": [0, 0]}).status_code == 200
+
+    from app.services.answer_keys import answer_keys
+
+    assert answer_keys.get(quiz_id) is not None
+    auth_client.delete(f"/api/v1/quizzes/{quiz_id}")
+    assert answer_keys.get(quiz_id) is None
+    res = auth_client.post(f"/api/v1/quizzes/{quiz_id}/submit", json={"answers": [0, 0]})
+    assert res.status_code == 404
+
+
+def test_submit_with_stale_key_returns_404(auth_client):
+    from sqlalchemy import text
+
+    from tests.conftest import TestSession
+
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    auth_client.post(f"/api/v1/quizzes/{quiz_id}/submit", json={"answers": [0, 0]})
+    # Simulate a delete served by another worker
+    with TestSession() as db:
+        db.execute(text("DELETE FROM quizzes WHERE id = :id"), {"id": quiz_id})
+        db.commit()
+
+    res = auth_client.post(f"/api/v1/quizzes/{quiz_id}/submit", json={"answers": [0, 0]})
+    assert res.status_code == 404
+
+
+def test_submit_attempts_batch(auth_client):
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    res = auth_client.post("/api/v1/quizzes/attempts/batch", json={"attempts": [
+        {"quiz_id": quiz_id, "answers": [0, 0], "completed_at": "2026-01-02T03:04:05Z"},
+        {"quiz_id": 9999, "answers": [0, 0]},
+        {"quiz_id": quiz_id, "answers": [0]},
+        {"quiz_id": quiz_id, "answers": [1, 0]},
+    ]})
+    assert res.status_code == 200
+    results = res.json()["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert results[0]["attempt"]["score"] == 2
+    assert results[0]["attempt"]["completed_at"].startswith("2026-01-02T03:04:05")
+    assert results[1]["error"] == "Quiz not found"
+    assert results[2]["error"] == "Expected 2 answers, got 1"
+    assert results[3]["attempt"]["score"] == 1
+    assert results[0]["attempt"]["id"] < results[3]["attempt"]["id"]
+
+    stats = auth_client.get("/api/v1/stats").json()
+    assert stats["total_quizzes_taken"] == 2
+
+
+def test_get_quiz_etag(auth_client):
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    res = auth_client.get(f"/api/v1/quizzes/{quiz_id}")
+    etag = res.headers["etag"]
+    assert not etag.startswith("W/")
+    assert res.headers["cache-control"] == "private, no-cache"
+
+    res = auth_client.get(f"/api/v1/quizzes/{quiz_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.content == b""
+
+    res = auth_client.get(f"/api/v1/quizzes/{quiz_id}", headers={"If-None-Match": '"other"'})
+    assert res.status_code == 200
+
+
+def test_list_quizzes_etag_changes_on_mutation(auth_client):
+    auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ)
+    etag = auth_client.get("/api/v1/quizzes").headers["etag"]
+    assert etag.startswith("W/")
+    assert auth_client.get("/api/v1/quizzes", headers={"If-None-Match": etag}).status_code == 304
+
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    res = auth_client.get("/api/v1/quizzes", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    etag = res.headers["etag"]
+
+    auth_client.delete(f"/api/v1/quizzes/{quiz_id}")
+    assert auth_client.get("/api/v1/quizzes", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_list_quizzes_etag_from_lagging_replica(auth_client, tmp_path, monkeypatch):
+    import sqlite3
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.database import build_async_engine, get_async_read_db
+    from app.main import app
+    from tests.conftest import _db_path, _override_async
+
+    etag = auth_client.get("/api/v1/quizzes").headers["etag"]
+    replica_path = str(tmp_path / "replica.db")
+    with sqlite3.connect(_db_path) as src, sqlite3.connect(replica_path) as dst:
+        src.backup(dst)
+    auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ)
+
+    # The replica has not seen the new quiz yet, so its list keeps the old tag
+    replica = async_sessionmaker(build_async_engine(f"sqlite:///{replica_path}", mode="serverless"))
+    monkeypatch.setitem(app.dependency_overrides, get_async_read_db, _override_async(replica))
+    res = auth_client.get("/api/v1/quizzes")
+    assert res.json()["total"] == 0
+    assert res.headers["etag"] == etag
+
+    monkeypatch.undo()
+    res = auth_client.get("/api/v1/quizzes", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.json()["total"] == 1
+
+
+def test_get_quiz_serves_cached_body(auth_client):
+    from app.services.response_cache import quiz_details
+
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    first = auth_client.get(f"/api/v1/quizzes/{quiz_id}")
+    second = auth_client.get(f"/api/v1/quizzes/{quiz_id}")
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert quiz_details.snapshot()["hits"] == 1
+
+    auth_client.delete(f"/api/v1/quizzes/{quiz_id}")
+    assert auth_client.get(f"/api/v1/quizzes/{quiz_id}").status_code == 404
+
+
+def test_response_cache_bounds():
+    from app.services.response_cache import ResponseCache
+
+    cache = ResponseCache(maxsize=2, ttl=60)
+    for key in (1, 2, 3):
+        cache.put(key, 1, f'"{key}"', b"{}")
+    assert cache.get(1) is None
+    assert cache.get(3) is not None
+
+    expired = ResponseCache(maxsize=2, ttl=0)
+    expired.put(1, 1, '"1"', b"{}")
+    assert expired.get(1) is None
+
+
+def test_model_responses_skip_revalidation(auth_client, monkeypatch):
+    import fastapi.routing
+
+    def fail(**kwargs):
+        raise AssertionError("response was validated twice")
+
+    monkeypatch.setattr(fastapi.routing, "serialize_response", fail)
+    res = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ)
+    assert res.status_code == 201
+    quiz_id = res.json()["id"]
+
+    res = auth_client.get("/api/v1/quizzes")
+    assert res.status_code == 200
+    assert res.headers["etag"].startswith("W/")
+    assert auth_client.post(f"/api/v1/quizzes/{quiz_id}/submit", json={"answers": [0, 0]}).status_code == 200
+    assert auth_client.get("/api/v1/stats").status_code == 200
+
+
+def test_export_import_round_trip(auth_client, monkeypatch):
+    import json
+
+    import app.routes.quizzes
+
+    monkeypatch.setattr(app.routes.quizzes, "IMPORT_CHUNK_SIZE", 2)
+    for i in range(3):
+        auth_client.post("/api/v1/quizzes", json={**SAMPLE_QUIZ, "title": f"Quiz {i}"})
+
+    res = auth_client.get("/api/v1/quizzes/export")
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/x-ndjson"
+    lines = res.content.splitlines()
+    exported = [json.loads(line) for line in lines]
+    assert [q["title"] for q in exported] == ["Quiz 0", "Quiz 1", "Quiz 2"]
+    assert exported[0]["questions"][1]["answers"] == [
+        {"answer_text": "Blue", "is_correct": True},
+        {"answer_text": "Red", "is_correct": False},
+    ]
+
+    body = b"\n".join([*lines, b"", b"not json", b'{"title": "No questions", "questions": []}'])
+    res = auth_client.post("/api/v1/quizzes/import", content=body)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["imported"] == 3
+    assert [e["line"] for e in data["errors"]] == [5, 6]
+
+    quizzes = auth_client.get("/api/v1/quizzes", params={"limit": 10}).json()
+    assert quizzes["total"] == 6
+    assert all(q["question_count"] == 2 for q in quizzes["quizzes"])
+
+
+def test_search_quizzes(auth_client):
+    biology = {
+        "title": "Cell Biology",
+        "questions": [{
+            "question_text": "Which organelle produces ATP?",
+            "explanation": "Mitochondria run oxidative phosphorylation",
+            "answers": [{"answer_text": "Mitochondria", "is_correct": True}],
+        }],
+    }
+    auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ)
+    biology_id = auth_client.post("/api/v1/quizzes", json=biology).json()["id"]
+
+    def titles(q):
+        res = auth_client.get("/api/v1/quizzes/search", params={"q": q})
+        assert res.status_code == 200
+        return [quiz["title"] for quiz in res.json()["quizzes"]]
+
+    assert titles("biology") == ["Cell Biology"]
+    assert titles("organelle") == ["Cell Biology"]
+    assert titles("phosphoryl") == ["Cell Biology"]  # prefix match on the last word
+    assert titles("sky color") == ["Test Quiz"]
+    assert titles('"OR title:') == []  # FTS5 syntax in user input is inert
+
+    auth_client.delete(f"/api/v1/quizzes/{biology_id}")
+    assert titles("organelle") == []
+
+
+def test_search_is_scoped_to_user(auth_client, test_client):
+    auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ)
+    test_client.post("/api/v1/auth/register", json={
+        "email": "other@example.com", "username": "other", "password": "password123",
+    })
+    token = test_client.post("/api/v1/auth/login", json={
+        "email": "other@example.com", "password": "password123",
+    }).json()["access_token"]
+    res = test_client.get(
+        "/api/v1/quizzes/search", params={"q": "sky"}, headers={"Authorization": f"Bearer {token}"}
+    )
+    assert res.json()["quizzes"] == []
+
+
+def test_quiz_analytics(auth_client):
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    empty = auth_client.get(f"/api/v1/quizzes/{quiz_id}/analytics").json()
+    assert empty["attempts"] == 0
+    assert sum(b["count"] for b in empty["histogram"]) == 0
+
+    for answers in ([0, 0], [0, 1], [1, 1]):
+        auth_client.post(f"/api/v1/quizzes/{quiz_id}/submit", json={"answers": answers})
+
+    # The empty result was cached; the attempts must have invalidated it
+    res = auth_client.get(f"/api/v1/quizzes/{quiz_id}/analytics")
+    assert res.status_code == 200
+    data = res.json()
+    assert data["attempts"] == 3
+    assert data["mean"] == 50.0
+    assert data["median"] == 50.0
+    assert data["p10"] == 10.0
+    assert data["p90"] == 90.0
+    assert len(data["histogram"]) == 10
+    counts = {b["start"]: b["count"] for b in data["histogram"]}
+    assert counts[0.0] == 1 and counts[50.0] == 1 and counts[90.0] == 1
+
+    etag = res.headers["etag"]
+    assert auth_client.get(
+        f"/api/v1/quizzes/{quiz_id}/analytics", headers={"If-None-Match": etag}
+    ).status_code == 304
+
+
+def test_quiz_analytics_not_found(auth_client):
+    assert auth_client.get("/api/v1/quizzes/9999/analytics").status_code == 404
+
+
+def test_quiz_analytics_questions(auth_client):
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    auth_client.post(f"/api/v1/quizzes/{quiz_id}/submit", json={"answers": [0, 0], "response_times_ms": [1000, 3000]})
+    auth_client.post(f"/api/v1/quizzes/{quiz_id}/submit", json={"answers": [1, -1]})
+    auth_client.post("/api/v1/quizzes/attempts/batch", json={"attempts": [
+        {"quiz_id": quiz_id, "answers": [0, 1], "response_times_ms": [2000, 5000]},
+    ]})
+
+    questions = auth_client.get(f"/api/v1/quizzes/{quiz_id}/analytics").json()["questions"]
+    assert questions == [
+        {"position": 0, "responses": 3, "correct": 2, "skipped": 0, "correct_rate": 66.7, "average_response_ms": 1500.0},
+        {"position": 1, "responses": 3, "correct": 1, "skipped": 1, "correct_rate": 33.3, "average_response_ms": 4000.0},
+    ]
+
+
+def test_submit_rejects_misaligned_response_times(auth_client):
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    res = auth_client.post(f"/api/v1/quizzes/{quiz_id}/submit", json={"answers": [0, 0], "response_times_ms": [1000]})
+    assert res.status_code == 422
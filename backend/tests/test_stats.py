@@ -1,3 +1,12 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+
+from app.manage import backfill_stats
+from app.models.daily_stats import UserDailyStats
+from app.models.user_stats import UserStats
+from tests.conftest import TestSession
+
 SAMPLE_QUIZ = {
     "title": "Stats Quiz",
     "questions": [
@@ -60,3 +69,119 @@ def test_stats_multiple_attempts(auth_client):
     assert data["best_score"] == 100.0
     assert data["average_score"] == 75.0
     assert len(data["recent_attempts"]) == 2
+
+
+def test_stats_include_batch_attempts(auth_client):
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+
+    auth_client.post("/api/v1/quizzes/attempts/batch", json={"attempts": [
+        {"quiz_id": quiz_id, "answers": [1, 1]},
+        {"quiz_id": quiz_id, "answers": [0, 1]},
+    ]})
+
+    data = auth_client.get("/api/v1/stats").json()
+    assert data["total_quizzes_taken"] == 2
+    assert data["average_score"] == 25.0
+    assert data["best_score"] == 50.0
+
+
+def test_stats_after_delete(auth_client):
+    kept = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    deleted = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    auth_client.post(f"/api/v1/quizzes/{kept}/submit", json={"answers": [0, 1]})
+    auth_client.post(f"/api/v1/quizzes/{deleted}/submit", json={"answers": [0, 0]})
+
+    auth_client.delete(f"/api/v1/quizzes/{deleted}")
+
+    data = auth_client.get("/api/v1/stats").json()
+    assert data["total_quizzes_created"] == 1
+    assert data["total_quizzes_taken"] == 1
+    assert data["average_score"] == 50.0
+    assert data["best_score"] == 50.0
+
+
+def test_backfill_stats(auth_client):
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    auth_client.post(f"/api/v1/quizzes/{quiz_id}/submit", json={"answers": [0, 1]})
+    before = auth_client.get("/api/v1/stats").json()
+
+    db = TestSession()
+    try:
+        db.execute(delete(UserStats))
+        db.commit()
+        backfill_stats(db)
+    finally:
+        db.close()
+
+    assert auth_client.get("/api/v1/stats").json() == before
+
+
+def test_stats_timeseries(auth_client):
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    today = datetime.now(timezone.utc)
+    three_days_ago = (today - timedelta(days=3)).isoformat()
+    auth_client.post(f"/api/v1/quizzes/{quiz_id}/submit", json={"answers": [0, 0]})
+    auth_client.post("/api/v1/quizzes/attempts/batch", json={"attempts": [
+        {"quiz_id": quiz_id, "answers": [0, 1]},
+        {"quiz_id": quiz_id, "answers": [1, 1], "completed_at": three_days_ago},
+        {"quiz_id": quiz_id, "answers": [0, 0], "completed_at": three_days_ago},
+    ]})
+
+    res = auth_client.get("/api/v1/stats/timeseries?range=7d")
+    assert res.status_code == 200
+    days = res.json()["days"]
+    assert len(days) == 7
+    assert days[-1] == {"day": today.date().isoformat(), "attempts": 2, "average_score": 75.0}
+    assert days[-4]["attempts"] == 2
+    assert days[-4]["average_score"] == 50.0
+    assert days[0]["attempts"] == 0
+    assert days[0]["average_score"] is None
+
+    assert len(auth_client.get("/api/v1/stats/timeseries").json()["days"]) == 90
+    assert auth_client.get("/api/v1/stats/timeseries?range=week").status_code == 422
+
+
+def test_stats_timeseries_rebuilt(auth_client):
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    auth_client.post(f"/api/v1/quizzes/{quiz_id}/submit", json={"answers": [0, 1]})
+    before = auth_client.get("/api/v1/stats/timeseries?range=7d").json()
+
+    db = TestSession()
+    try:
+        db.execute(delete(UserDailyStats))
+        db.commit()
+        backfill_stats(db)
+    finally:
+        db.close()
+    assert auth_client.get("/api/v1/stats/timeseries?range=7d").json() == before
+
+    auth_client.delete(f"/api/v1/quizzes/{quiz_id}")
+    days = auth_client.get("/api/v1/stats/timeseries?range=7d").json()["days"]
+    assert sum(d["attempts"] for d in days) == 0
+
+
+def test_batch_attempt_with_offset(auth_client):
+    quiz_id = auth_client.post("/api/v1/quizzes", json=SAMPLE_QUIZ).json()["id"]
+    day = datetime.now(timezone.utc).date() - timedelta(days=3)
+    # 01:00 at UTC+5 is still the previous day in UTC
+    completed_at = f"{day.isoformat()}T01:00:00+05:00"
+    res = auth_client.post("/api/v1/quizzes/attempts/batch", json={"attempts": [
+        {"quiz_id": quiz_id, "answers": [0, 1], "completed_at": completed_at},
+    ]})
+    stored = datetime.fromisoformat(res.json()["results"][0]["attempt"]["completed_at"])
+    assert stored.replace(tzinfo=stored.tzinfo or timezone.utc) == datetime.fromisoformat(completed_at)
+    assert stored.replace(tzinfo=None) == datetime(day.year, day.month, day.day) - timedelta(hours=4)
+
+    before = auth_client.get("/api/v1/stats/timeseries?range=7d").json()
+    assert before["days"][-5] == {
+        "day": (day - timedelta(days=1)).isoformat(), "attempts": 1, "average_score": 50.0
+    }
+
+    db = TestSession()
+    try:
+        db.execute(delete(UserDailyStats))
+        db.commit()
+        backfill_stats(db)
+    finally:
+        db.close()
+    assert auth_client.get("/api/v1/stats/timeseries?range=7d").json() == before
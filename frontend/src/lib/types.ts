@@ -51,8 +51,9 @@ export interface Quiz {
 
 export interface QuizListResponse {
   quizzes: Quiz[];
-  total: number;
+  total: number | null;
   has_more: boolean;
+  next_cursor: string | null;
 }
 
 export interface QuizDetail {
@@ -101,12 +102,21 @@ export interface QuizCreate {
 export interface UserSettings {
   ai_provider: string | null;
   has_api_key: boolean;
+  ai_cache_opt_out: boolean;
   is_verified: boolean;
 }
 
+export interface SimilarQuiz {
+  content_hash: string;
+  title: string;
+  question_count: number;
+  distance: number;
+}
+
 export interface UserSettingsUpdate {
   ai_provider?: string | null;
   ai_api_key?: string | null;
+  ai_cache_opt_out?: boolean;
 }
 
 export interface AdminAccount {
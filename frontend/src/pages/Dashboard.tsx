@@ -17,6 +17,7 @@ export default function Dashboard() {
   const { toast } = useToast();
   const [quizzes, setQuizzes] = useState<Quiz[]>([]);
   const [hasMore, setHasMore] = useState(false);
+  const [cursor, setCursor] = useState<string | null>(null);
   const [stats, setStats] = useState<StatsResponse | null>(null);
   const [loading, setLoading] = useState(true);
   const [loadingMore, setLoadingMore] = useState(false);
@@ -26,12 +27,15 @@ export default function Dashboard() {
 
   useEffect(() => {
     Promise.all([
-      api.get<QuizListResponse>('/quizzes', { params: { skip: 0, limit: PAGE_SIZE } }),
+      api.get<QuizListResponse>('/quizzes', {
+        params: { cursor: '', limit: PAGE_SIZE, include_total: false },
+      }),
       api.get('/stats'),
     ])
       .then(([quizRes, statsRes]) => {
         setQuizzes(quizRes.data.quizzes);
         setHasMore(quizRes.data.has_more);
+        setCursor(quizRes.data.next_cursor);
         setStats(statsRes.data);
       })
       .catch((err) => {
@@ -44,10 +48,11 @@ export default function Dashboard() {
     setLoadingMore(true);
     try {
       const res = await api.get<QuizListResponse>('/quizzes', {
-        params: { skip: quizzes.length, limit: PAGE_SIZE },
+        params: { cursor: cursor ?? '', limit: PAGE_SIZE, include_total: false },
       });
       setQuizzes((prev) => [...prev, ...res.data.quizzes]);
       setHasMore(res.data.has_more);
+      setCursor(res.data.next_cursor);
     } catch (err: any) {
       setError(err.response?.data?.detail || 'Failed to load more quizzes');
     } finally {
@@ -23,6 +23,7 @@ export default function Settings() {
   const [settings, setSettings] = useState<UserSettings | null>(null);
   const [provider, setProvider] = useState<string>('');
   const [apiKey, setApiKey] = useState('');
+  const [cacheOptOut, setCacheOptOut] = useState(false);
   const [aiSaving, setAiSaving] = useState(false);
   const [aiError, setAiError] = useState('');
   const [aiSuccess, setAiSuccess] = useState('');
@@ -55,6 +56,7 @@ export default function Settings() {
       .then(([settingsRes, profileRes]) => {
         setSettings(settingsRes.data);
         setProvider(settingsRes.data.ai_provider || '');
+        setCacheOptOut(settingsRes.data.ai_cache_opt_out);
         setProfile(profileRes.data);
         setFirstName(profileRes.data.first_name || '');
         setLastName(profileRes.data.last_name || '');
@@ -169,8 +171,9 @@ export default function Settings() {
     setAiSuccess('');
     setAiSaving(true);
     try {
-      const body: Record<string, string | null> = {
+      const body: Record<string, string | boolean | null> = {
         ai_provider: provider || null,
+        ai_cache_opt_out: cacheOptOut,
       };
       if (apiKey) body.ai_api_key = apiKey;
       if (!provider) body.ai_api_key = null;
@@ -178,6 +181,7 @@ export default function Settings() {
       const res = await api.put('/settings', body);
       setSettings(res.data);
       setProvider(res.data.ai_provider || '');
+      setCacheOptOut(res.data.ai_cache_opt_out);
       setApiKey('');
       setAiSuccess('Settings saved');
       setTimeout(() => setAiSuccess(''), 3000);
@@ -474,6 +478,25 @@ export default function Settings() {
             </div>
           )}
 
+          {provider && (
+            <label htmlFor="ai-cache-opt-out" className="flex items-start gap-3 cursor-pointer">
+              <input
+                id="ai-cache-opt-out"
+                type="checkbox"
+                checked={cacheOptOut}
+                onChange={(e) => setCacheOptOut(e.target.checked)}
+                className="mt-0.5 w-4 h-4 rounded border-gray-300 text-indigo-600 focus:ring-indigo-500"
+              />
+              <span className="text-sm text-gray-700">
+                Always generate a fresh quiz
+                <span className="block text-xs text-gray-400">
+                  By default, an image someone has already uploaded reuses the quiz generated for it. Fresh quizzes
+                  use your API key every time, and your uploads are not shared.
+                </span>
+              </span>
+            </label>
+          )}
+
           <button
             type="submit"
             disabled={aiSaving}
@@ -1,10 +1,10 @@
 import { useState, useRef, useCallback, useEffect } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import api from '../lib/api';
-import type { UserSettings } from '../lib/types';
+import type { SimilarQuiz, UserSettings } from '../lib/types';
 import ErrorMessage from '../components/ErrorMessage';
 import LoadingSpinner from '../components/LoadingSpinner';
-import { ImageUp, Upload, X, Info } from 'lucide-react';
+import { ImageUp, Upload, X, Info, Copy } from 'lucide-react';
 
 export default function UploadImage() {
   const [file, setFile] = useState<File | null>(null);
@@ -13,6 +13,7 @@ export default function UploadImage() {
   const [loading, setLoading] = useState(false);
   const [dragOver, setDragOver] = useState(false);
   const [aiSettings, setAiSettings] = useState<UserSettings | null>(null);
+  const [similar, setSimilar] = useState<SimilarQuiz | null>(null);
   const inputRef = useRef<HTMLInputElement>(null);
   const navigate = useNavigate();
 
@@ -30,6 +31,7 @@ export default function UploadImage() {
       return;
     }
     setError('');
+    setSimilar(null);
     setFile(f);
     const reader = new FileReader();
     reader.onload = (e) => setPreview(e.target?.result as string);
@@ -48,17 +50,19 @@ export default function UploadImage() {
 
   const clearFile = () => {
     setFile(null);
+    setSimilar(null);
     setPreview(null);
     if (inputRef.current) inputRef.current.value = '';
   };
 
-  const handleSubmit = async () => {
+  const generate = async (reuse?: string) => {
     if (!file) return;
     setError('');
     setLoading(true);
     try {
       const formData = new FormData();
       formData.append('file', file);
+      if (reuse) formData.append('reuse', reuse);
       await api.post('/quizzes/generate-from-image', formData, {
         headers: { 'Content-Type': 'multipart/form-data' },
       });
@@ -70,6 +74,27 @@ export default function UploadImage() {
     }
   };
 
+  const handleSubmit = async () => {
+    if (!file) return;
+    // Offer a quiz already generated from a similar image before paying for a new one
+    if (aiSettings?.has_api_key && !aiSettings.ai_cache_opt_out) {
+      try {
+        const formData = new FormData();
+        formData.append('file', file);
+        const res = await api.post('/quizzes/similar', formData, {
+          headers: { 'Content-Type': 'multipart/form-data' },
+        });
+        if (res.data.match) {
+          setSimilar(res.data.match);
+          return;
+        }
+      } catch {
+        // Fall through to a fresh generation
+      }
+    }
+    await generate();
+  };
+
   if (loading) {
     return (
       <div>
@@ -137,13 +162,40 @@ export default function UploadImage() {
             <span className="font-medium">{file?.name}</span>
             {' '}&mdash; {((file?.size || 0) / 1024).toFixed(1)} KB
           </p>
-          <button
-            onClick={handleSubmit}
-            className="flex items-center justify-center gap-2 w-full py-3 bg-indigo-600 text-white font-medium rounded-xl hover:bg-indigo-700 transition-colors cursor-pointer"
-          >
-            <Upload className="w-4 h-4" />
-            Generate Quiz from Image
-          </button>
+          {similar ? (
+            <div className="border border-indigo-200 bg-indigo-50 rounded-xl p-4 space-y-3">
+              <div className="flex items-start gap-2">
+                <Copy className="w-4 h-4 text-indigo-600 mt-0.5 shrink-0" />
+                <p className="text-sm text-indigo-900">
+                  A quiz was already generated from a very similar image:{' '}
+                  <span className="font-medium">{similar.title}</span> ({similar.question_count} questions).
+                  Use it instead of generating a new one?
+                </p>
+              </div>
+              <div className="flex flex-col sm:flex-row gap-2">
+                <button
+                  onClick={() => generate(similar.content_hash)}
+                  className="flex-1 py-3 bg-indigo-600 text-white font-medium rounded-xl hover:bg-indigo-700 transition-colors cursor-pointer"
+                >
+                  Use this quiz
+                </button>
+                <button
+                  onClick={() => generate()}
+                  className="flex-1 py-3 bg-white border border-gray-300 text-gray-700 font-medium rounded-xl hover:bg-gray-50 transition-colors cursor-pointer"
+                >
+                  Generate a new one
+                </button>
+              </div>
+            </div>
+          ) : (
+            <button
+              onClick={handleSubmit}
+              className="flex items-center justify-center gap-2 w-full py-3 bg-indigo-600 text-white font-medium rounded-xl hover:bg-indigo-700 transition-colors cursor-pointer"
+            >
+              <Upload className="w-4 h-4" />
+              Generate Quiz from Image
+            </button>
+          )}
         </div>
       )}
 